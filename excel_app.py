@@ -1,8 +1,15 @@
 import streamlit as st
+import io
 import os
-import pandas as pd
 import tempfile
-from excel_manager import excelManager
+from excel_manager import excelManager, configure_logging, get_column_letter
+
+# Start the (queued, non-blocking) log file writer once per server process
+@st.cache_resource
+def _start_logging():
+    return configure_logging()
+
+_start_logging()
 
 st.title("Excel Manager App")
 
@@ -13,17 +20,168 @@ if 'file_path' not in st.session_state:
     st.session_state.file_path = None
 if 'temp_dir' not in st.session_state:
     st.session_state.temp_dir = tempfile.mkdtemp()
+if 'preview_cache' not in st.session_state:
+    st.session_state.preview_cache = {}
+if 'pending_save' not in st.session_state:
+    st.session_state.pending_save = None
+
+# Rows per page in the sheet preview and in result tables
+PAGE_SIZES = [50, 100, 500]
+# The preview reads this many pages at a time: the visible one plus a prefetch buffer
+PREVIEW_BLOCK_PAGES = 4
+# Preview blocks kept in the session
+PREVIEW_CACHE_BLOCKS = 16
+
+# pandas is only needed to build display tables, so import it on first use
+def make_dataframe(*args, **kwargs):
+    import pandas as pd
+    return pd.DataFrame(*args, **kwargs)
 
 # Function to reset the app
 def reset_app():
     st.session_state.excel_manager = None
     st.session_state.file_path = None
+    st.session_state.preview_cache = {}
+    st.session_state.range_result = None
+    st.session_state.columns_result = None
+    st.session_state.pending_save = None
+
+# Show the result of excelManager.diff as one table per sheet
+def render_diff(result):
+    change_count = sum(len(changes) for changes in result["changes"].values())
+    st.info(f"{change_count} changes; {result['rows_unchanged']} of {result['rows_compared']} rows unchanged")
+    if result["sheets_added"]:
+        st.success(f"Sheets added: {', '.join(result['sheets_added'])}")
+    if result["sheets_removed"]:
+        st.warning(f"Sheets removed: {', '.join(result['sheets_removed'])}")
+    for sheet_name, changes in result["changes"].items():
+        st.write(f"**{sheet_name}** ({len(changes)} changes)")
+        rows = [{
+            "Cell": change["cell"],
+            "Type": change["type"],
+            "Old": "" if change["old"] is None else str(change["old"]),
+            "New": "" if change["new"] is None else str(change["new"]),
+            "Attributes": ", ".join(change.get("attributes", [])),
+        } for change in changes]
+        st.dataframe(make_dataframe(rows), hide_index=True)
+
+# Show row_count rows one page at a time; read_rows(offset, count) reads just the visible page
+def render_paginated(row_count, read_rows, key, columns=None):
+    page_size = st.selectbox("Rows per page", PAGE_SIZES, key=f"{key}_page_size")
+    pages = max((row_count + page_size - 1) // page_size, 1)
+    page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, key=f"{key}_page")
+    start = (page - 1) * page_size
+    page_rows = read_rows(start, min(page_size, row_count - start)) if row_count > start else []
+    st.caption(f"Rows {start + 1 if page_rows else 0}-{start + len(page_rows)} of {row_count:,}")
+    st.dataframe(make_dataframe(page_rows, columns=columns))
+
+# Page through a range resolved by get_range_bounds
+def render_range(manager, bounds):
+    sheet_name, start_row, start_col, end_row, end_col = bounds
+    # Rows past the sheet's data would only be blank
+    last_row = min(end_row, manager.get_sheet_extent(sheet_name)[0])
+    render_paginated(
+        max(last_row - start_row + 1, 0),
+        lambda offset, count: manager.read_window(sheet_name, start_row + offset, count, start_col, end_col),
+        "range_result",
+        columns=[get_column_letter(col) for col in range(start_col, end_col + 1)],
+    )
+
+# Page through columns located by get_column_spans, reading each one's visible slice
+def render_columns(manager, sheet_name, spans):
+    def read_rows(offset, count):
+        columns = []
+        for _, col, first_row, row_count in spans:
+            visible = max(min(count, row_count - offset), 0)
+            window = manager.read_window(sheet_name, first_row + offset, visible, col, col) if visible else []
+            columns.append([row[0] for row in window] + [''] * (count - len(window)))
+        return [list(row) for row in zip(*columns)]
+    
+    render_paginated(max(row_count for _, _, _, row_count in spans), read_rows, "columns_result",
+                     columns=[header for header, _, _, _ in spans])
+
+# Read one block of preview rows through the session cache
+def read_preview_block(manager, sheet_name, block_start, block_rows):
+    version = manager.version
+    if st.session_state.file_path and os.path.exists(st.session_state.file_path):
+        version += (os.stat(st.session_state.file_path).st_mtime_ns,)
+    key = (st.session_state.file_path, version, sheet_name, block_start, block_rows)
+    cache = st.session_state.preview_cache
+    if key not in cache:
+        while len(cache) >= PREVIEW_CACHE_BLOCKS:
+            cache.pop(next(iter(cache)))
+        cache[key] = manager.read_window(sheet_name, block_start, block_rows)
+    return cache[key]
+
+# Page through a whole sheet, reading only the visible window plus a prefetch buffer
+def render_sheet_preview(manager, sheet_name):
+    row_count, column_count = manager.get_sheet_extent(sheet_name)
+    page_size = st.selectbox("Rows per page", PAGE_SIZES, key="preview_page_size")
+    pages = max((row_count + page_size - 1) // page_size, 1)
+    page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, key="preview_page")
+    
+    block_rows = page_size * PREVIEW_BLOCK_PAGES
+    first_row = (page - 1) * page_size + 1
+    block_start = (first_row - 1) // block_rows * block_rows + 1
+    block = read_preview_block(manager, sheet_name, block_start, block_rows)
+    offset = first_row - block_start
+    page_rows = block[offset:offset + page_size]
+    
+    st.caption(f"Rows {first_row if page_rows else 0}-{first_row + len(page_rows) - 1} of {row_count:,}")
+    st.dataframe(make_dataframe(
+        page_rows,
+        columns=[get_column_letter(col) for col in range(1, column_count + 1)],
+        index=range(first_row, first_row + len(page_rows)),
+    ))
+    
+    # On the last page of a block, fetch the next block after this page is on screen
+    next_block = block_start + block_rows
+    if offset + page_size >= block_rows and next_block <= row_count:
+        read_preview_block(manager, sheet_name, next_block, block_rows)
+
+# Sidebar panel showing the excelManager instrumentation stats
+def render_debug_panel(manager):
+    st.sidebar.header("Debug")
+    collect = st.sidebar.checkbox("Collect performance stats", value=manager.instrumentation_enabled, key="collect_stats")
+    if collect and not manager.instrumentation_enabled:
+        manager.enable_instrumentation()
+    elif not collect and manager.instrumentation_enabled:
+        manager.disable_instrumentation()
+    if not collect:
+        return
+    
+    stats = manager.get_stats()
+    rows = []
+    for kind in ("methods", "spans"):
+        for name, entry in stats[kind].items():
+            rows.append({
+                "Operation": name if kind == "methods" else f"span: {name}",
+                "Calls": entry["count"],
+                "Mean (ms)": round(entry["mean_seconds"] * 1000, 3),
+                "Max (ms)": round(entry["max_seconds"] * 1000, 3),
+                "Total (ms)": round(entry["total_seconds"] * 1000, 3),
+            })
+    if rows:
+        st.sidebar.dataframe(make_dataframe(rows), hide_index=True)
+    else:
+        st.sidebar.info("No calls recorded yet.")
+    if stats["counters"]:
+        st.sidebar.json(stats["counters"])
+    
+    if st.sidebar.button("Reset Stats"):
+        manager.reset_stats()
+    st.sidebar.download_button(
+        label="Download stats (Prometheus)",
+        data=manager.export_stats(format="prometheus"),
+        file_name="excel_manager_stats.prom",
+        mime="text/plain"
+    )
 
 # Sidebar for file operations
 st.sidebar.header("File Operations")
 
 # File upload
-uploaded_file = st.sidebar.file_uploader("Upload Excel file", type=["xlsx", "xls"])
+uploaded_file = st.sidebar.file_uploader("Upload Excel file", type=["xlsx", "xlsm", "xls", "xlsb"])
 if uploaded_file is not None:
     # Save uploaded file to temp directory
     file_path = os.path.join(st.session_state.temp_dir, uploaded_file.name)
@@ -33,18 +191,23 @@ if uploaded_file is not None:
     # Initialize ExcelManager with the uploaded file
     st.session_state.excel_manager = excelManager(file_path)
     st.session_state.file_path = file_path
+    st.session_state.pending_save = None
     st.sidebar.success(f"Loaded: {uploaded_file.name}")
+    if st.session_state.excel_manager.read_only:
+        st.sidebar.info("This format is read-only: reading, comparing and exporting work, but changes can't be saved back to it.")
 
 # Create new file
 new_file_name = st.sidebar.text_input("Or create a new file (name.xlsx):")
 if st.sidebar.button("Create New File") and new_file_name:
-    if not new_file_name.endswith(('.xlsx', '.xls')):
+    # New workbooks are always .xlsx; the legacy formats can only be read
+    if not new_file_name.lower().endswith('.xlsx'):
         new_file_name += '.xlsx'
     
     file_path = os.path.join(st.session_state.temp_dir, new_file_name)
     st.session_state.excel_manager = excelManager()
     st.session_state.excel_manager.create_workbook(file_path)
     st.session_state.file_path = file_path
+    st.session_state.pending_save = None
     st.sidebar.success(f"Created: {new_file_name}")
 
 # Reset app
@@ -57,7 +220,7 @@ if st.session_state.excel_manager is not None:
     st.subheader("Excel File Management")
     
     # Tabs for different operations
-    tab1, tab2, tab3, tab4 = st.tabs(["Sheets", "Read", "Write", "Delete"])
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(["Sheets", "Read", "Write", "Delete", "Compare"])
     
     with tab1:
         st.subheader("Sheet Operations")
@@ -74,10 +237,13 @@ if st.session_state.excel_manager is not None:
         
         # Create new sheet
         new_sheet_name = st.text_input("New sheet name:")
-        if st.button("Create Sheet") and new_sheet_name:
-            st.session_state.excel_manager.create_sheet(new_sheet_name)
-            st.success(f"Created sheet: {new_sheet_name}")
-            st.session_state.excel_manager.save()
+        if st.button("Create Sheet", disabled=st.session_state.excel_manager.read_only) and new_sheet_name:
+            try:
+                st.session_state.excel_manager.create_sheet(new_sheet_name)
+                st.session_state.excel_manager.save()
+                st.success(f"Created sheet: {new_sheet_name}")
+            except Exception as e:
+                st.error(f"Error creating sheet: {str(e)}")
     
     with tab2:
         st.subheader("Read Operations")
@@ -98,16 +264,28 @@ if st.session_state.excel_manager is not None:
                 except Exception as e:
                     st.error(f"Error reading cell: {str(e)}")
             
+            # Preview the whole sheet page by page
+            st.subheader("Preview Sheet")
+            if st.checkbox("Show preview", key="show_preview"):
+                try:
+                    render_sheet_preview(st.session_state.excel_manager, selected_sheet)
+                except Exception as e:
+                    st.error(f"Error previewing sheet: {str(e)}")
+            
             # Read range
             st.subheader("Read Range")
             range_reference = st.text_input("Range Reference (e.g. A1:C5):", "A1:B5")
             
             if st.button("Read Range"):
                 try:
-                    values = st.session_state.excel_manager.read_range(selected_sheet, range_reference)
-                    # Convert to pandas DataFrame for better display
-                    df = pd.DataFrame(values)
-                    st.dataframe(df)
+                    # Only the bounds are kept in the session; each page is read when shown
+                    st.session_state.range_result = st.session_state.excel_manager.get_range_bounds(selected_sheet, range_reference)
+                except Exception as e:
+                    st.session_state.range_result = None
+                    st.error(f"Error reading range: {str(e)}")
+            if st.session_state.get("range_result"):
+                try:
+                    render_range(st.session_state.excel_manager, st.session_state.range_result)
                 except Exception as e:
                     st.error(f"Error reading range: {str(e)}")
             
@@ -157,7 +335,7 @@ if st.session_state.excel_manager is not None:
                     if items:
                         st.info(f"Found {len(items)} items:")
                         # Display items as a dataframe for better formatting
-                        df = pd.DataFrame({"Items": items})
+                        df = make_dataframe({"Items": items})
                         st.dataframe(df)
                     else:
                         st.warning("No items found starting from this cell.")
@@ -184,28 +362,34 @@ if st.session_state.excel_manager is not None:
                     if not columns_cell_refs:
                         st.warning("Please enter cell references or column titles.")
                     else:
-                        columns_data = st.session_state.excel_manager.read_columns(
+                        spans = st.session_state.excel_manager.get_column_spans(
                             columns_sheet, 
                             columns_cell_refs, 
                             use_titles=use_titles,
                             start_row=start_row_value if use_titles else None
                         )
                         
-                        if columns_data and len(columns_data) > 1:  # Check if we have data (header row + at least one data row)
-                            st.info(f"Found columns data:")
-                            # Create DataFrame with the first row as column headers
-                            headers = columns_data[0]
-                            data = columns_data[1:]
-                            df = pd.DataFrame(data, columns=headers)
-                            st.dataframe(df)
+                        if any(row_count for _, _, _, row_count in spans):  # Check if any column has data
+                            st.session_state.columns_result = (columns_sheet, spans)
                         else:
+                            st.session_state.columns_result = None
                             st.warning("No column data found.")
+                except Exception as e:
+                    st.session_state.columns_result = None
+                    st.error(f"Error getting columns: {str(e)}")
+            if st.session_state.get("columns_result"):
+                st.info(f"Found columns data:")
+                try:
+                    render_columns(st.session_state.excel_manager, *st.session_state.columns_result)
                 except Exception as e:
                     st.error(f"Error getting columns: {str(e)}")
     
     with tab3:
         st.subheader("Write Operations")
         
+        if st.session_state.excel_manager.read_only:
+            st.warning("This workbook was loaded from a read-only format (.xls/.xlsb), so writes are disabled.")
+        
         # Select sheet
         if st.session_state.excel_manager:
             sheet_names = st.session_state.excel_manager.get_sheet_names()
@@ -220,7 +404,7 @@ if st.session_state.excel_manager is not None:
                 try:
                     st.session_state.excel_manager.write_cell(selected_sheet, cell_reference, write_value)
                     st.success(f"Wrote '{write_value}' to cell {cell_reference}")
-                    st.session_state.excel_manager.save()
+                    st.session_state.pending_save = st.session_state.excel_manager.save_async()
                 except Exception as e:
                     st.error(f"Error writing cell: {str(e)}")
             
@@ -232,20 +416,38 @@ if st.session_state.excel_manager is not None:
                 "Enter CSV data (comma-separated values, one row per line):",
                 "1,2,3\n4,5,6\n7,8,9"
             )
+            csv_header = st.checkbox("First line is a header", key="range_header")
+            number_format = st.selectbox("Number format", ["None", "currency", "number", "integer", "percent"], key="range_format")
             
             if st.button("Write Range"):
                 try:
-                    # Parse CSV data
-                    rows = []
-                    for line in csv_data.strip().split("\n"):
-                        values = line.split(",")
-                        rows.append(values)
-                    
-                    st.session_state.excel_manager.write_range(selected_sheet, start_cell, rows)
+                    st.session_state.excel_manager.import_table(
+                        selected_sheet,
+                        io.StringIO(csv_data.strip()),
+                        start_cell,
+                        header=csv_header,
+                        number_formats=None if number_format == "None" else number_format,
+                    )
                     st.success(f"Wrote data to range starting at {start_cell}")
-                    st.session_state.excel_manager.save()
+                    st.session_state.pending_save = st.session_state.excel_manager.save_async()
                 except Exception as e:
                     st.error(f"Error writing range: {str(e)}")
+            
+            # Import a CSV or Parquet file
+            st.subheader("Import Table")
+            table_file = st.file_uploader("Upload a CSV or Parquet file", type=["csv", "parquet"], key="import_file")
+            table_start = st.text_input("Start Cell (e.g. A1):", "A1", key="import_start_cell")
+            
+            if table_file is not None and st.button("Import Table"):
+                try:
+                    table_path = os.path.join(st.session_state.temp_dir, table_file.name)
+                    with open(table_path, "wb") as f:
+                        f.write(table_file.getbuffer())
+                    row_count = st.session_state.excel_manager.import_table(selected_sheet, table_path, table_start)
+                    st.success(f"Imported {row_count} rows starting at {table_start}")
+                    st.session_state.pending_save = st.session_state.excel_manager.save_async()
+                except Exception as e:
+                    st.error(f"Error importing table: {str(e)}")
     
     with tab4:
         st.subheader("Delete Operations")
@@ -255,22 +457,59 @@ if st.session_state.excel_manager is not None:
             sheet_names = st.session_state.excel_manager.get_sheet_names()
             sheet_to_delete = st.selectbox("Select sheet to delete", sheet_names)
             
-            if st.button("Delete Sheet") and len(sheet_names) > 1:
-                st.session_state.excel_manager.delete_sheet(sheet_to_delete)
-                st.success(f"Deleted sheet: {sheet_to_delete}")
-                st.session_state.excel_manager.save()
+            if st.button("Delete Sheet", disabled=st.session_state.excel_manager.read_only) and len(sheet_names) > 1:
+                try:
+                    st.session_state.excel_manager.delete_sheet(sheet_to_delete)
+                    st.session_state.excel_manager.save()
+                    st.success(f"Deleted sheet: {sheet_to_delete}")
+                except Exception as e:
+                    st.error(f"Error deleting sheet: {str(e)}")
             elif len(sheet_names) <= 1:
                 st.error("Cannot delete the only sheet in the workbook.")
     
+    with tab5:
+        st.subheader("Compare Versions")
+        
+        # Compare against the last saved version of this file
+        if st.button("Compare with Saved File"):
+            try:
+                render_diff(st.session_state.excel_manager.diff())
+            except Exception as e:
+                st.error(f"Error comparing: {str(e)}")
+        
+        # Compare against another version of the workbook
+        previous_file = st.file_uploader("Or upload an earlier version", type=["xlsx"], key="compare_file")
+        if previous_file is not None and st.button("Compare with Uploaded File"):
+            try:
+                previous_path = os.path.join(st.session_state.temp_dir, f"previous_{previous_file.name}")
+                with open(previous_path, "wb") as f:
+                    f.write(previous_file.getbuffer())
+                render_diff(st.session_state.excel_manager.diff(previous_path))
+            except Exception as e:
+                st.error(f"Error comparing: {str(e)}")
+    
     # Download the file
     if st.session_state.file_path:
-        with open(st.session_state.file_path, "rb") as file:
-            file_name = os.path.basename(st.session_state.file_path)
-            st.download_button(
-                label="Download Excel file",
-                data=file,
-                file_name=file_name,
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            )
+        # Background saves are only waited for when the file is actually wanted,
+        # so edits never block on the save
+        pending_save = st.session_state.pending_save
+        ready = pending_save is None or pending_save.done()
+        if not ready:
+            st.caption("Saving changes in the background...")
+            ready = st.button("Prepare download") and st.session_state.excel_manager.flush()
+        if pending_save is not None and pending_save.done() and pending_save.exception() is not None:
+            st.error(f"Error saving changes: {pending_save.exception()}")
+        if ready:
+            with open(st.session_state.file_path, "rb") as file:
+                file_name = os.path.basename(st.session_state.file_path)
+                st.download_button(
+                    label="Download Excel file",
+                    data=file,
+                    file_name=file_name,
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                )
+    
+    # Rendered last so the stats include this run's actions
+    render_debug_panel(st.session_state.excel_manager)
 else:
     st.info("Please upload an Excel file or create a new one to start.")
\ No newline at end of file
@@ -0,0 +1,397 @@
+"""
+Benchmark suite for excelManager.
+
+Generates synthetic workbooks shaped like assets/COST_PLAN_PROJECT_NAME.xlsx
+(title rows, a header row of cost columns, currency-formatted activity rows
+and a totals row), times each public operation on them and records peak
+memory. Results are written as JSON so runs from different commits can be
+compared:
+
+    python excel_benchmark.py --sizes 1k,100k --output before.json
+    git checkout my-branch
+    python excel_benchmark.py --sizes 1k,100k --output after.json --compare before.json
+
+--compare exits with status 1 when any operation got slower than the
+allowed ratio, so it can gate a release. The cold-start cost of importing
+excel_manager is always measured and gated as well: every run exits with
+status 1 if the import exceeds IMPORT_BUDGET_MS (override with
+--import-budget MS, 0 to skip), pulls in heavy dependencies or touches the
+filesystem, or if excelProbe metadata queries load openpyxl. To run only
+that gate:
+
+    python excel_benchmark.py --sizes "" --many-sheets 0
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from datetime import datetime, timezone
+
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+
+from excel_manager import excelManager
+
+SHEET_NAME = "Cost Breakdown"
+HEADER_ROW = 5
+FIRST_DATA_ROW = HEADER_ROW + 1
+HEADERS = ["Activities", "Project ABC", "Total Costs", "Emergency 15%", "Full Up Costs", "HST", "Total Project Costs"]
+CURRENCY_FORMAT = '_-[$$-1009]* #,##0.00_-;\\-[$$-1009]* #,##0.00_-;_-[$$-1009]* "-"??_-;_-@_-'
+SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+
+# Derived columns of an activity row, written as formulas the way the cost plan does
+DERIVED_FORMULAS = {
+    "C": "=B{row}",
+    "D": "=C{row}*0.15",
+    "E": "=C{row}+D{row}",
+    "F": "=E{row}*0.15",
+    "G": "=E{row}+F{row}",
+}
+_FORMULA_CELL_RE = re.compile(r'(<c r="([A-Z]+)(\d+)"[^>]*><f>[^<]*</f>)<v\s*/>')
+
+
+def _cost_values(base):
+    """
+    The results of one activity row's formulas, keyed by column letter.
+    """
+    emergency = base * 0.15
+    full_up = base + emergency
+    hst = full_up * 0.15
+    return {"B": base, "C": base, "D": emergency, "E": full_up, "F": hst, "G": full_up + hst}
+
+
+def _currency_cell(sheet, value):
+    cell = WriteOnlyCell(sheet, value=value)
+    cell.number_format = CURRENCY_FORMAT
+    return cell
+
+
+def _write_cost_sheet(workbook, title, rows, rng):
+    """
+    Write one cost sheet and return the base cost of each activity row.
+    The derived columns and the totals row are formulas, as in the asset.
+    """
+    sheet = workbook.create_sheet(title)
+    sheet.append([])
+    sheet.append(["PROJECT NAME"])
+    sheet.append([])
+    sheet.append([" CONTRACT YEARS (Vote 5 )"])
+    sheet.append(HEADERS)
+
+    bases = []
+    for index in range(1, rows + 1):
+        row_number = FIRST_DATA_ROW + index - 1
+        base = round(rng.uniform(1_000, 3_000_000), 2)
+        bases.append(base)
+        row = [f"Activity {index}", _currency_cell(sheet, base)]
+        row.extend(_currency_cell(sheet, formula.format(row=row_number)) for formula in DERIVED_FORMULAS.values())
+        sheet.append(row)
+
+    # Totals row directly under the data, as read_total expects
+    last_row = FIRST_DATA_ROW + rows - 1
+    total_row = ["Total"]
+    for column in "BCDEFG":
+        total_row.append(_currency_cell(sheet, f"=SUM({column}{FIRST_DATA_ROW}:{column}{last_row})"))
+    sheet.append(total_row)
+    return bases
+
+
+def _store_formula_results(path, bases_by_sheet):
+    """
+    Fill in the cached result of every formula, as Excel does when it saves.
+    openpyxl writes formulas without results, which would leave every derived
+    cell reading as empty.
+    """
+    from excel_manager import _sheet_part_names
+
+    with zipfile.ZipFile(path) as source:
+        parts = _sheet_part_names(source)
+        patched = {}
+        for title, bases in bases_by_sheet.items():
+            rows = [_cost_values(base) for base in bases]
+            totals = {column: sum(values[column] for values in rows) for column in "BCDEFG"}
+            total_row = FIRST_DATA_ROW + len(rows)
+
+            def result(match):
+                column, row_number = match.group(2), int(match.group(3))
+                values = totals if row_number == total_row else rows[row_number - FIRST_DATA_ROW]
+                return f"{match.group(1)}<v>{values[column]!r}</v>"
+
+            xml = source.read(parts[title]).decode("utf-8")
+            patched[parts[title]] = _FORMULA_CELL_RE.sub(result, xml).encode("utf-8")
+
+        temp_path = f"{path}.tmp"
+        with zipfile.ZipFile(temp_path, "w", zipfile.ZIP_DEFLATED) as target:
+            for item in source.infolist():
+                target.writestr(item, patched.get(item.filename) or source.read(item.filename))
+    os.replace(temp_path, path)
+
+
+def generate_workbook(path, rows, sheets=1, seed=0):
+    """
+    Write a synthetic cost plan with the given number of activity rows per sheet.
+    """
+    rng = random.Random(seed)
+    workbook = openpyxl.Workbook(write_only=True)
+    titles = [SHEET_NAME] + [f"{SHEET_NAME} {index}" for index in range(2, sheets + 1)]
+    bases_by_sheet = {title: _write_cost_sheet(workbook, title, rows, rng) for title in titles}
+    workbook.save(path)
+    _store_formula_results(path, bases_by_sheet)
+    return path
+
+
+def _operations(rows):
+    """
+    The (name, callable(manager)) pairs timed on a loaded workbook.
+    """
+    last_row = FIRST_DATA_ROW + rows
+    window_end = min(last_row, FIRST_DATA_ROW + 999)
+    write_block = [[f"Bench {i}", i, i * 1.15] for i in range(1_000)]
+    return [
+        ("read_cell_x1000", lambda m: [m.read_cell(SHEET_NAME, f"G{row}") for row in range(FIRST_DATA_ROW, FIRST_DATA_ROW + 1_000)]),
+        ("read_range_1k_rows", lambda m: m.read_range(SHEET_NAME, f"A{FIRST_DATA_ROW}:G{window_end}")),
+        ("read_total", lambda m: m.read_total(SHEET_NAME, f"G{FIRST_DATA_ROW}")),
+        ("read_items", lambda m: m.read_items(SHEET_NAME, f"A{FIRST_DATA_ROW}", offset=1)),
+        ("read_title_total", lambda m: m.read_title_total(SHEET_NAME, f"A{HEADER_ROW}", "Total Project Costs")),
+        ("read_columns", lambda m: m.read_columns(SHEET_NAME, "Activities,HST", use_titles=True, start_row=HEADER_ROW)),
+        ("write_range_1k_rows", lambda m: m.write_range(SHEET_NAME, f"J{FIRST_DATA_ROW}", write_block)),
+        # Edit one cell first so every repeat saves a real change
+        ("save", lambda m: (m.write_cell(SHEET_NAME, f"K{FIRST_DATA_ROW}", time.perf_counter()), m.save())),
+    ]
+
+
+def _measure(function, memory):
+    """
+    Time one call; when memory is True, run it again under tracemalloc for the peak.
+    """
+    gc.collect()
+    start = time.perf_counter()
+    function()
+    seconds = time.perf_counter() - start
+
+    peak = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            function()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return seconds, peak
+
+
+def run_scenario(name, rows, sheets, work_dir, repeat=1, memory=True):
+    """
+    Generate one workbook and benchmark every operation on it.
+
+    Each operation's time is the best of `repeat` runs.
+    """
+    source = os.path.join(work_dir, f"{name}.xlsx")
+    start = time.perf_counter()
+    generate_workbook(source, rows, sheets)
+    print(f"[{name}] generated {rows:,} rows x {sheets} sheet(s) in {time.perf_counter() - start:.1f}s",
+          file=sys.stderr)
+
+    results = []
+
+    def record(operation, seconds, peak):
+        results.append({"scenario": name, "rows": rows, "sheets": sheets, "operation": operation,
+                        "seconds": round(seconds, 6), "peak_bytes": peak})
+        print(f"[{name}] {operation:<22} {seconds:10.4f}s" + (f" {peak / 2**20:10.1f} MiB" if peak else ""),
+              file=sys.stderr)
+
+    # Loading gets its own copy per run so save() in a later step never changes the input
+    target = os.path.join(work_dir, f"{name}-work.xlsx")
+    best = None
+    for _ in range(repeat):
+        shutil.copyfile(source, target)
+        seconds, peak = _measure(lambda: excelManager(target), memory=False)
+        best = seconds if best is None else min(best, seconds)
+    if memory:
+        _, peak = _measure(lambda: excelManager(target), memory=True)
+    record("load_workbook", best, peak)
+
+    manager = excelManager(target)
+    for operation, function in _operations(rows):
+        best = peak = None
+        for _ in range(repeat):
+            seconds, run_peak = _measure(lambda: function(manager), memory=memory)
+            best = seconds if best is None else min(best, seconds)
+            peak = run_peak if peak is None else max(peak, run_peak or 0)
+        record(operation, best, peak)
+    manager.close()
+    return results
+
+
+# Median cold import of excel_manager allowed, in milliseconds (measured at 25-45ms)
+IMPORT_BUDGET_MS = 100
+# Modules excel_manager must not load at import time; they are imported on first use
+LAZY_MODULES = ("openpyxl", "pandas", "zipfile", "xml.etree.ElementTree", "json", "logging.handlers")
+# Metadata queries through excelProbe must never need these
+PROBE_EXCLUDED_MODULES = ("openpyxl", "numpy", "pandas")
+PROBE_WORKBOOK = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "COST_PLAN_PROJECT_NAME.xlsx")
+_IMPORT_PROBE = """
+import sys, time
+start = time.perf_counter()
+import excel_manager
+seconds = time.perf_counter() - start
+loaded = [m for m in %r if m in sys.modules]
+with excel_manager.excelProbe(%r) as probe:
+    probe.get_dimensions()
+    for name in probe.get_sheet_names():
+        probe.get_rows(name, max_rows=30)
+    probe.has_title("Total")
+probe_loaded = [m for m in %r if m in sys.modules]
+import json
+print(json.dumps({"seconds": seconds, "loaded": loaded + ["%%s (via excelProbe)" %% m for m in probe_loaded]}))
+"""
+
+
+def measure_import(runs=5):
+    """
+    Time `import excel_manager` in fresh interpreters and return
+    (median seconds, heavy modules loaded, files created in the working directory).
+    
+    Each interpreter then runs excelProbe queries on the sample cost plan;
+    modules those load are reported among the heavy modules.
+    """
+    repo_dir = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, PYTHONPATH=repo_dir + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    timings = []
+    loaded = set()
+    created = set()
+    for _ in range(runs):
+        cwd = tempfile.mkdtemp(prefix="excel-import-")
+        try:
+            output = subprocess.run([sys.executable, "-c", _IMPORT_PROBE % (LAZY_MODULES, PROBE_WORKBOOK, PROBE_EXCLUDED_MODULES)], cwd=cwd, env=env,
+                                    capture_output=True, text=True, check=True).stdout
+            created.update(os.listdir(cwd))
+        finally:
+            shutil.rmtree(cwd, ignore_errors=True)
+        probe = json.loads(output.strip().splitlines()[-1])
+        timings.append(probe["seconds"])
+        loaded.update(probe["loaded"])
+    timings.sort()
+    return timings[len(timings) // 2], sorted(loaded), sorted(created)
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, max_ratio):
+    """
+    Print a comparison against a previous run and return the regressed operations.
+    """
+    previous = {(r["scenario"], r["operation"]): r for r in baseline["results"]}
+    regressions = []
+    print(f"{'scenario':<14} {'operation':<22} {'before':>10} {'after':>10} {'ratio':>7}")
+    for result in results:
+        before = previous.get((result["scenario"], result["operation"]))
+        if before is None or not before["seconds"]:
+            continue
+        ratio = result["seconds"] / before["seconds"]
+        flag = "  REGRESSION" if ratio > max_ratio else ""
+        print(f"{result['scenario']:<14} {result['operation']:<22} {before['seconds']:10.4f} "
+              f"{result['seconds']:10.4f} {ratio:7.2f}{flag}")
+        if flag:
+            regressions.append(result)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark excelManager operations on synthetic cost plans.")
+    parser.add_argument("--sizes", default="1k,100k",
+                        help=f"comma-separated row counts per sheet, from {', '.join(SIZES)} or plain integers")
+    parser.add_argument("--many-sheets", type=int, default=50,
+                        help="sheet count for the many-sheets scenario (1k rows each); 0 to skip")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per operation; the best time is kept")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak-memory pass")
+    parser.add_argument("--output", help="write JSON results to this file (default: stdout)")
+    parser.add_argument("--compare", help="JSON results of a previous run to compare against")
+    parser.add_argument("--max-ratio", type=float, default=1.25,
+                        help="slowdown ratio above which --compare reports a regression")
+    parser.add_argument("--import-budget", type=float, metavar="MS", default=IMPORT_BUDGET_MS,
+                        help=f"fail if importing excel_manager takes longer than this many milliseconds "
+                             f"(default {IMPORT_BUDGET_MS:g}; 0 to skip the import gate)")
+    args = parser.parse_args(argv)
+
+    scenarios = []
+    for size in args.sizes.split(","):
+        size = size.strip().lower()
+        if not size:
+            continue
+        rows = SIZES[size] if size in SIZES else int(size)
+        scenarios.append((f"rows-{size}", rows, 1))
+    if args.many_sheets:
+        scenarios.append((f"sheets-{args.many_sheets}", 1_000, args.many_sheets))
+
+    import_seconds, import_loaded, import_created = measure_import()
+    print(f"[startup] import excel_manager {import_seconds * 1000:8.1f}ms", file=sys.stderr)
+    results = [{"scenario": "startup", "rows": 0, "sheets": 0, "operation": "import_excel_manager",
+                "seconds": round(import_seconds, 6), "peak_bytes": None}]
+
+    work_dir = tempfile.mkdtemp(prefix="excel-bench-")
+    try:
+        for name, rows, sheets in scenarios:
+            results.extend(run_scenario(name, rows, sheets, work_dir, repeat=args.repeat,
+                                        memory=not args.no_memory))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "openpyxl": openpyxl.__version__,
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    status = 0
+    if args.import_budget:
+        if import_seconds * 1000 > args.import_budget:
+            print(f"Import took {import_seconds * 1000:.1f}ms, over the {args.import_budget:g}ms budget", file=sys.stderr)
+            status = 1
+        if import_loaded:
+            print(f"Importing excel_manager loaded: {', '.join(import_loaded)}", file=sys.stderr)
+            status = 1
+        if import_created:
+            print(f"Importing excel_manager created files: {', '.join(import_created)}", file=sys.stderr)
+            status = 1
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.max_ratio):
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
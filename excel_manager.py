@@ -1,42 +1,1500 @@
+import atexit
+import datetime
+import functools
+import gc
 import logging
+import math
+import numbers
 import os
-import openpyxl
-from openpyxl import Workbook
-from openpyxl import load_workbook
-from openpyxl.utils import get_column_letter, column_index_from_string
-from openpyxl.utils.cell import coordinate_from_string, coordinate_to_tuple
+import posixpath
+import queue
+import shutil
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
 import re
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("excel_manager.log"),
-        logging.StreamHandler()
-    ]
-)
+# Heavy dependencies (openpyxl, zipfile, ElementTree, json, logging.handlers)
+# are imported where they are first needed. openpyxl alone accounts for most of
+# the cold-start time of this module, and many short-lived processes only use
+# a fraction of it (e.g. excelProbe never needs openpyxl, so the coordinate
+# helpers it uses are implemented here).
+
+
+@functools.lru_cache(maxsize=None)
+def get_column_letter(col):
+    if not 1 <= col <= MAX_COLUMN:
+        raise ValueError(f"Invalid column index {col}")
+    letters = ""
+    while col:
+        col, remainder = divmod(col - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+@functools.lru_cache(maxsize=None)
+def column_index_from_string(column_letter):
+    from openpyxl.utils import column_index_from_string as _column_index_from_string
+    return _column_index_from_string(column_letter)
+
+
+def range_boundaries(range_string):
+    from openpyxl.utils import range_boundaries as _range_boundaries
+    return _range_boundaries(range_string)
+
+
+# Same control characters openpyxl refuses to write into a cell
+ILLEGAL_CHARACTERS_RE = re.compile(r'[\000-\010]|[\013-\014]|[\016-\037]')
+
+
+def xml_escape(text):
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+# Excel's grid limits
+MAX_ROW = 1048576
+MAX_COLUMN = 16384
+
+# Optional sheet prefix: 'Quoted name' (which may contain ! and doubled '') or a bare name
+_SHEET_PREFIX_RE = re.compile(r"^(?:'((?:[^']|'')+)'|([^'!]+))!(.+)$")
+_CELL_REF_RE = re.compile(r"^\$?([A-Za-z]{1,3})\$?(\d+)$")
+_COLUMN_REF_RE = re.compile(r"^\$?([A-Za-z]{1,3})$")
+_ROW_REF_RE = re.compile(r"^\$?(\d+)$")
+_DEFINED_NAME_RE = re.compile(r"^[A-Za-z_\\][\w.\\]*$")
+
+
+def _column_index(letters):
+    index = 0
+    for letter in letters.upper():
+        index = index * 26 + ord(letter) - 64
+    return index
+
+
+def coordinate_to_tuple(coordinate):
+    """
+    Convert a cell coordinate such as 'B6' to (row, column).
+    """
+    match = _CELL_REF_RE.match(coordinate)
+    if not match:
+        raise ValueError(f"Invalid cell coordinates ({coordinate})")
+    return int(match.group(2)), _column_index(match.group(1))
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_reference(reference):
+    """
+    Parse an A1-style reference into (sheet, name, min_row, min_col, max_row, max_col).
+    
+    Supports an optional sheet prefix (Sheet2!A1, 'My Sheet'!A1, 'Q1!Plan'!A1),
+    absolute markers ($A$1), cells (A1), ranges (A1:C3), whole columns (A:C)
+    and whole rows (1:3). Whole-column/row bounds that are open are None.
+    Anything else that looks like an identifier is returned as a defined
+    name with all coordinates None; sheet is None when not given.
+    
+    Results are memoized, so repeated references cost a dict lookup.
+    Raises ValueError for malformed references.
+    """
+    sheet = None
+    match = _SHEET_PREFIX_RE.match(reference)
+    if match:
+        quoted, bare, reference = match.groups()
+        sheet = quoted.replace("''", "'") if quoted is not None else bare.strip()
+    reference = reference.strip()
+    
+    start, colon, end = reference.partition(':')
+    if not colon:
+        cell = _CELL_REF_RE.match(start)
+        if cell:
+            row, col = int(cell.group(2)), _column_index(cell.group(1))
+            bounds = (row, col, row, col)
+        elif _DEFINED_NAME_RE.match(start):
+            return sheet, start, None, None, None, None
+        else:
+            raise ValueError(f"Invalid cell reference: {reference}")
+    else:
+        first, last = _CELL_REF_RE.match(start), _CELL_REF_RE.match(end)
+        if first and last:
+            bounds = (int(first.group(2)), _column_index(first.group(1)),
+                      int(last.group(2)), _column_index(last.group(1)))
+        elif _COLUMN_REF_RE.match(start) and _COLUMN_REF_RE.match(end):
+            bounds = (None, _column_index(start.lstrip('$')), None, _column_index(end.lstrip('$')))
+        elif _ROW_REF_RE.match(start) and _ROW_REF_RE.match(end):
+            bounds = (int(start.lstrip('$')), None, int(end.lstrip('$')), None)
+        else:
+            raise ValueError(f"Invalid cell reference: {reference}")
+    
+    min_row, min_col, max_row, max_col = bounds
+    for row in (min_row, max_row):
+        if row is not None and not 1 <= row <= MAX_ROW:
+            raise ValueError(f"Invalid cell reference: {reference}")
+    for col in (min_col, max_col):
+        if col is not None and not 1 <= col <= MAX_COLUMN:
+            raise ValueError(f"Invalid cell reference: {reference}")
+    # Normalise reversed ranges such as C3:A1
+    if min_row is not None and min_row > max_row:
+        min_row, max_row = max_row, min_row
+    if min_col is not None and min_col > max_col:
+        min_col, max_col = max_col, min_col
+    return sheet, None, min_row, min_col, max_row, max_col
+
+# Logging is configured by the host application (see configure_logging);
+# importing this module never installs handlers or opens files
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+_log_listener = None
+
+
+def configure_logging(level=logging.INFO, log_file="excel_manager.log", console=True):
+    """
+    Send excel_manager logs to a file and/or the console without blocking callers.
+    
+    Records are put on an in-memory queue and written by a background
+    listener thread, so hot read/write paths never wait on disk I/O. Calling
+    this again replaces the previous configuration. Per-cell operations log
+    at DEBUG; at INFO and above they are summarized as call counts instead
+    (see excelManager.log_call_summary).
+    """
+    global _log_listener
+    import logging.handlers
+    shutdown_logging()
+    
+    handlers = []
+    if log_file:
+        handlers.append(logging.FileHandler(log_file))
+    if console:
+        handlers.append(logging.StreamHandler())
+    formatter = logging.Formatter(LOG_FORMAT)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    log_queue = queue.SimpleQueue()
+    for handler in [h for h in logger.handlers if isinstance(h, logging.handlers.QueueHandler)]:
+        logger.removeHandler(handler)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(level)
+    # The listener owns the output now; don't also hand records to the root logger
+    logger.propagate = False
+    
+    _log_listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _log_listener.start()
+    return _log_listener
+
+
+def shutdown_logging():
+    """
+    Flush queued log records and stop the listener started by configure_logging.
+    """
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        for handler in _log_listener.handlers:
+            handler.close()
+        _log_listener = None
+
+
+atexit.register(shutdown_logging)
+
+class _ReadWriteLock:
+    """
+    A reader/writer lock allowing many concurrent readers or a single writer.
+    
+    Both sides are reentrant for the owning thread, and the thread holding the
+    write lock may also take the read lock. Waiting writers block new readers
+    so a steady stream of reads cannot starve a save.
+    """
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = {}  # thread id -> number of read holds
+        self._writer = None
+        self._write_depth = 0
+        self._writers_waiting = 0
+    
+    def acquire_read(self):
+        me = threading.get_ident()
+        with self._condition:
+            if self._writer == me or me in self._readers:
+                self._readers[me] = self._readers.get(me, 0) + 1
+                return
+            while self._writer is not None or self._writers_waiting:
+                self._condition.wait()
+            self._readers[me] = 1
+    
+    def release_read(self):
+        me = threading.get_ident()
+        with self._condition:
+            count = self._readers[me] - 1
+            if count:
+                self._readers[me] = count
+            else:
+                del self._readers[me]
+                self._condition.notify_all()
+    
+    def acquire_write(self):
+        me = threading.get_ident()
+        with self._condition:
+            if self._writer == me:
+                self._write_depth += 1
+                return
+            if me in self._readers:
+                raise RuntimeError("Cannot upgrade a read lock to a write lock")
+            self._writers_waiting += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._condition.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = me
+            self._write_depth = 1
+    
+    def release_write(self):
+        with self._condition:
+            self._write_depth -= 1
+            if not self._write_depth:
+                self._writer = None
+                self._condition.notify_all()
+    
+    @contextmanager
+    def read(self):
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+    
+    @contextmanager
+    def write(self):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+class _Instrumentation:
+    """
+    Latency histograms and counters collected while instrumentation is enabled.
+    """
+    # Upper bounds (seconds) of the latency histogram buckets
+    BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, math.inf)
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}  # (kind, name) -> [bucket counts, count, total, max]
+        self._counters = Counter()
+    
+    def reset(self):
+        with self._lock:
+            self._histograms = {}
+            self._counters = Counter()
+    
+    def observe(self, kind, name, seconds):
+        with self._lock:
+            histogram = self._histograms.get((kind, name))
+            if histogram is None:
+                histogram = self._histograms[(kind, name)] = [[0] * len(self.BUCKETS), 0, 0.0, 0.0]
+            for index, bound in enumerate(self.BUCKETS):
+                if seconds <= bound:
+                    histogram[0][index] += 1
+                    break
+            histogram[1] += 1
+            histogram[2] += seconds
+            histogram[3] = max(histogram[3], seconds)
+    
+    def add(self, counter, amount=1):
+        with self._lock:
+            self._counters[counter] += amount
+    
+    def snapshot(self):
+        """
+        Return a plain-dict copy of all statistics.
+        """
+        with self._lock:
+            histograms = {kind_name: (list(h[0]), h[1], h[2], h[3]) for kind_name, h in self._histograms.items()}
+            counters = dict(self._counters)
+        
+        stats = {"methods": {}, "spans": {}, "counters": counters}
+        for (kind, name), (buckets, count, total, longest) in sorted(histograms.items()):
+            cumulative = 0
+            bucket_counts = {}
+            for bound, bucket_count in zip(self.BUCKETS, buckets):
+                cumulative += bucket_count
+                bucket_counts["+Inf" if bound == math.inf else repr(bound)] = cumulative
+            stats[kind][name] = {
+                "count": count,
+                "total_seconds": total,
+                "mean_seconds": total / count if count else 0.0,
+                "max_seconds": longest,
+                "buckets": bucket_counts,
+            }
+        return stats
+    
+    def to_prometheus(self, prefix="excel_manager"):
+        """
+        Render the statistics in the Prometheus text exposition format.
+        """
+        stats = self.snapshot()
+        lines = []
+        for kind, label in (("methods", "method"), ("spans", "span")):
+            metric = f"{prefix}_{label}_seconds"
+            lines.append(f"# HELP {metric} Latency of excelManager {kind}.")
+            lines.append(f"# TYPE {metric} histogram")
+            for name, entry in stats[kind].items():
+                name = name.replace("\\", "\\\\").replace('"', '\\"')
+                for bound, count in entry["buckets"].items():
+                    lines.append(f'{metric}_bucket{{{label}="{name}",le="{bound}"}} {count}')
+                lines.append(f'{metric}_sum{{{label}="{name}"}} {entry["total_seconds"]!r}')
+                lines.append(f'{metric}_count{{{label}="{name}"}} {entry["count"]}')
+        for counter, value in sorted(stats["counters"].items()):
+            metric = f"{prefix}_{counter}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+        return "\n".join(lines) + "\n"
+
+
+@contextmanager
+def _gc_paused():
+    """
+    Suspend the cyclic garbage collector while building large lookup structures.
+    
+    A loaded workbook keeps millions of objects alive, and every collection
+    triggered by the allocations of a bulk build walks all of them; nothing
+    built here forms reference cycles.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+_TOKEN_RE = re.compile(r"\w+")
+_NUMBER_START = frozenset("0123456789+-.$")
+
+
+class _SearchIndex:
+    """
+    Inverted index of cell values across all sheets.
+    
+    Maps each normalized value (numbers as float, text stripped and
+    case-folded) and each word token of text values to the set of
+    (sheet name, row, column) keys holding it. The per-cell entries
+    are kept so a single cell can be updated in place after a write.
+    """
+    
+    def __init__(self):
+        self.values = {}  # normalized value -> {(sheet, row, col)}
+        self.tokens = {}  # word token -> {(sheet, row, col)}
+        self.cells = {}   # (sheet, row, col) -> (normalized value, tokens)
+    
+    @staticmethod
+    def normalize(value):
+        """
+        Return the lookup key of a cell value, or None for empty cells.
+        
+        Numbers (and text that parses as one, e.g. "12,500" or "$12,500.00")
+        become floats so that 12500, 12500.0 and "12500" all match.
+        """
+        if value is None or isinstance(value, bool):
+            return None if value is None else str(value).casefold()
+        if isinstance(value, (int, float)):
+            return float(value)
+        text = str(value).strip()
+        if not text:
+            return None
+        # Only text that starts like a number is worth the cost of a failed float()
+        if text[0] in _NUMBER_START:
+            try:
+                return float(text.replace(',', '').replace('$', ''))
+            except ValueError:
+                pass
+        return text.casefold()
+    
+    def add(self, key, value):
+        normalized = self.normalize(value)
+        if normalized is None:
+            return
+        tokens = frozenset(_TOKEN_RE.findall(normalized)) if isinstance(normalized, str) else frozenset()
+        self.cells[key] = (normalized, tokens)
+        self.values.setdefault(normalized, set()).add(key)
+        for token in tokens:
+            self.tokens.setdefault(token, set()).add(key)
+    
+    def remove(self, key):
+        entry = self.cells.pop(key, None)
+        if entry is None:
+            return
+        normalized, tokens = entry
+        self._discard(self.values, normalized, key)
+        for token in tokens:
+            self._discard(self.tokens, token, key)
+    
+    def update(self, key, value):
+        self.remove(key)
+        self.add(key, value)
+    
+    def remove_sheet(self, sheet_name):
+        for key in [key for key in self.cells if key[0] == sheet_name]:
+            self.remove(key)
+    
+    @staticmethod
+    def _discard(mapping, name, key):
+        keys = mapping.get(name)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del mapping[name]
+    
+    def find(self, value):
+        normalized = self.normalize(value)
+        return set(self.values.get(normalized, ())) if normalized is not None else set()
+    
+    def search(self, text, partial=False):
+        """
+        Return the keys of cells containing every word of text.
+        
+        With partial=True each word may also match part of a longer word
+        ("conting" matches "Contingency"); the scan is over the distinct
+        words of the workbook rather than over its cells.
+        """
+        words = _TOKEN_RE.findall(str(text).casefold())
+        if not words:
+            return set()
+        result = None
+        for word in words:
+            if partial:
+                keys = set()
+                for token, token_keys in self.tokens.items():
+                    if word in token:
+                        keys |= token_keys
+            else:
+                keys = self.tokens.get(word, set())
+            result = set(keys) if result is None else result & keys
+            if not result:
+                break
+        return result
+
+
+def _reads(method):
+    """
+    Run the method under the instance's shared (read) lock.
+    """
+    name = method.__name__
+    
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._count_call(name)
+        with self._lock.read():
+            if self._instrumentation is None:
+                return method(self, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self._instrumentation.observe("methods", name, time.perf_counter() - start)
+    return wrapper
+
+
+def _writes(method):
+    """
+    Run the method under the instance's exclusive (write) lock.
+    """
+    name = method.__name__
+    
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._count_call(name)
+        with self._lock.write():
+            if self._instrumentation is None:
+                return method(self, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self._instrumentation.observe("methods", name, time.perf_counter() - start)
+    return wrapper
+
+
+# Namespaces used when reading the package structure of an .xlsx file
+_NS_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_NS_DOC_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_NS_PKG_REL = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+_SHEET_DATA_RE = re.compile(r'<sheetData\s*/>|<sheetData>(.*?)</sheetData>', re.DOTALL)
+_ROW_RE = re.compile(r'<row\b([^>]*?)(/?)>')
+_CELL_RE = re.compile(r'<c\b([^>]*?)(?:/>|>(.*?)</c>)', re.DOTALL)
+_REF_ATTR_RE = re.compile(r'\br="([A-Z]+)?(\d+)"')
+_STYLE_ATTR_RE = re.compile(r'\bs="(\d+)"')
+_SPANS_ATTR_RE = re.compile(r'\s+spans="[^"]*"')
+_DIMENSION_RE = re.compile(r'<dimension ref="([^"]*)"\s*/>')
+_FORMULA_RE = re.compile(r'<f[\s>/]')
+_VALUE_RE = re.compile(r'<v\s*/>|<v>.*?</v>', re.DOTALL)
+_TYPE_ATTR_RE = re.compile(r'\s+t="[^"]*"')
+_CALC_PR_RE = re.compile(r'<calcPr\b([^>]*?)(/?)>')
+# Elements that may follow calcPr in workbook.xml, in schema order
+_AFTER_CALC_PR = ("oleSize", "customWorkbookViews", "pivotCaches", "smartTagPr", "smartTagTypes",
+                  "webPublishing", "fileRecoveryPr", "webPublishObjects", "extLst")
+
+
+def _workbook_part_name(archive):
+    """
+    Return the name of the main workbook part of an .xlsx archive.
+    """
+    import xml.etree.ElementTree as ET
+    rels = ET.fromstring(archive.read("_rels/.rels"))
+    for rel in rels.iter(f"{{{_NS_PKG_REL}}}Relationship"):
+        if rel.get("Type", "").endswith("/officeDocument"):
+            return rel.get("Target").lstrip("/")
+    return "xl/workbook.xml"
+
+
+def _rels_part_name(part_name):
+    directory, name = posixpath.split(part_name)
+    return posixpath.join(directory, "_rels", f"{name}.rels")
+
+
+def _resolve_target(source_part, target):
+    """
+    Resolve a relationship target against the part that declares it.
+    """
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join(posixpath.dirname(source_part), target))
+
+
+def _sheet_part_names(archive):
+    """
+    Map sheet titles to their worksheet part names inside an .xlsx archive, in workbook order.
+    """
+    import xml.etree.ElementTree as ET
+    workbook_part = _workbook_part_name(archive)
+    workbook_xml = ET.fromstring(archive.read(workbook_part))
+    rels_xml = ET.fromstring(archive.read(_rels_part_name(workbook_part)))
+    
+    targets = {rel.get("Id"): rel.get("Target") for rel in rels_xml.iter(f"{{{_NS_PKG_REL}}}Relationship")}
+    parts = {}
+    for sheet in workbook_xml.iter(f"{{{_NS_MAIN}}}sheet"):
+        target = targets.get(sheet.get(f"{{{_NS_DOC_REL}}}id"))
+        if target is not None:
+            parts[sheet.get("name")] = _resolve_target(workbook_part, target)
+    return parts
+
+
+def _shared_strings_part_name(archive):
+    """
+    Return the name of the shared strings part of an .xlsx archive, or None if it has none.
+    """
+    import xml.etree.ElementTree as ET
+    workbook_part = _workbook_part_name(archive)
+    try:
+        rels_xml = ET.fromstring(archive.read(_rels_part_name(workbook_part)))
+    except KeyError:
+        return None
+    for rel in rels_xml.iter(f"{{{_NS_PKG_REL}}}Relationship"):
+        if rel.get("Type", "").endswith("/sharedStrings"):
+            part = _resolve_target(workbook_part, rel.get("Target"))
+            return part if part in archive.NameToInfo else None
+    return None
+
+
+def _cell_xml(ref, value, style):
+    """
+    Build the <c> element for a single cell, or return None if the value
+    cannot be written without openpyxl's full serializer (dates, rich types).
+    """
+    attrs = f' r="{ref}"' + (f' s="{style}"' if style else '')
+    if value is None:
+        return f'<c{attrs}/>'
+    if isinstance(value, bool):
+        return f'<c{attrs} t="b"><v>{int(value)}</v></c>'
+    # Number types from numpy and the like register with the numbers ABCs, but
+    # their repr is not a valid <v> ("np.float64(2.5)"), so write them as plain numbers
+    if isinstance(value, numbers.Integral):
+        return f'<c{attrs}><v>{int(value)}</v></c>'
+    if isinstance(value, numbers.Real):
+        value = float(value)
+        if not math.isfinite(value):
+            return None
+        return f'<c{attrs}><v>{value!r}</v></c>'
+    if isinstance(value, str):
+        if ILLEGAL_CHARACTERS_RE.search(value):
+            return None
+        if value.startswith('=') and len(value) > 1:
+            return f'<c{attrs}><f>{xml_escape(value[1:])}</f></c>'
+        return f'<c{attrs} t="inlineStr"><is><t xml:space="preserve">{xml_escape(value)}</t></is></c>'
+    return None
+
+
+def _patch_row_cells(row_number, body, edits):
+    """
+    Replace or insert the edited cells (column -> value) within the body of a <row>.
+    
+    Returns the new row body, or None if the row cannot be patched safely.
+    """
+    cells = []
+    for match in _CELL_RE.finditer(body):
+        ref = _REF_ATTR_RE.search(match.group(1))
+        if not ref or not ref.group(1):
+            return None
+        cells.append((column_index_from_string(ref.group(1)), match))
+    
+    pieces = []
+    position = 0
+    pending = sorted(edits.items())
+    for col, match in cells:
+        # Emit new cells that sort before this existing one
+        while pending and pending[0][0] < col:
+            new_col, value = pending.pop(0)
+            xml = _cell_xml(f"{get_column_letter(new_col)}{row_number}", value, None)
+            if xml is None:
+                return None
+            pieces.append(body[position:match.start()])
+            pieces.append(xml)
+            position = match.start()
+        if pending and pending[0][0] == col:
+            _, value = pending.pop(0)
+            inner = match.group(2) or ''
+            # Rewriting the anchor of a shared or array formula would break the cells that depend on it
+            if '<f' in inner and ('t="shared"' in inner or 't="array"' in inner) and 'ref="' in inner:
+                return None
+            style = _STYLE_ATTR_RE.search(match.group(1))
+            xml = _cell_xml(f"{get_column_letter(col)}{row_number}", value, style.group(1) if style else None)
+            if xml is None:
+                return None
+            pieces.append(body[position:match.start()])
+            pieces.append(xml)
+            position = match.end()
+    pieces.append(body[position:])
+    for new_col, value in pending:
+        xml = _cell_xml(f"{get_column_letter(new_col)}{row_number}", value, None)
+        if xml is None:
+            return None
+        pieces.append(xml)
+    return ''.join(pieces)
+
+
+def _drop_formula_values(xml):
+    """
+    Remove the cached results of the formula cells in a worksheet part.
+    
+    Once a cell has been edited they may be stale, and anything reading the
+    file without recalculating (the data-only reload, pandas, other tools)
+    would take them for current values. Without them formulas read as empty
+    until Excel recalculates, as after a full save by openpyxl.
+    """
+    match = _SHEET_DATA_RE.search(xml)
+    if not match or match.group(1) is None:
+        return xml
+    
+    def strip(cell):
+        inner = cell.group(2)
+        if not inner or not _FORMULA_RE.search(inner):
+            return cell.group(0)
+        # The type attribute describes the cached result, so it goes with it
+        return f'<c{_TYPE_ATTR_RE.sub("", cell.group(1))}>{_VALUE_RE.sub("", inner)}</c>'
+    
+    return f'{xml[:match.start(1)]}{_CELL_RE.sub(strip, match.group(1))}{xml[match.end(1):]}'
+
+
+def _patch_sheet_xml(xml, edits):
+    """
+    Apply cell edits ((row, column) -> value) to a worksheet part.
+    
+    Everything outside the edited cells is kept verbatim. Returns the patched
+    XML, or None if the part has a shape this patcher does not handle.
+    """
+    match = _SHEET_DATA_RE.search(xml)
+    if not match:
+        return None
+    body = match.group(1) or ''
+    body_start = match.start(1) if match.group(1) is not None else None
+    
+    by_row = {}
+    for (row, col), value in edits.items():
+        by_row.setdefault(row, {})[col] = value
+    
+    rows = []
+    for row_match in _ROW_RE.finditer(body):
+        ref = _REF_ATTR_RE.search(row_match.group(1))
+        if not ref:
+            return None
+        if row_match.group(2):
+            end, inner = row_match.end(), None
+        else:
+            end = body.index('</row>', row_match.end()) + len('</row>')
+            inner = body[row_match.end():end - len('</row>')]
+        rows.append((int(ref.group(2)), row_match, end, inner))
+    
+    pieces = []
+    position = 0
+    pending = sorted(by_row.items())
+    for row_number, row_match, end, inner in rows:
+        while pending and pending[0][0] < row_number:
+            new_row, cells = pending.pop(0)
+            new_body = _patch_row_cells(new_row, '', cells)
+            if new_body is None:
+                return None
+            pieces.append(body[position:row_match.start()])
+            pieces.append(f'<row r="{new_row}">{new_body}</row>')
+            position = row_match.start()
+        if pending and pending[0][0] == row_number:
+            _, cells = pending.pop(0)
+            new_body = _patch_row_cells(row_number, inner or '', cells)
+            if new_body is None:
+                return None
+            # The spans hint may no longer cover the row, so drop it
+            attrs = _SPANS_ATTR_RE.sub('', row_match.group(1))
+            pieces.append(body[position:row_match.start()])
+            pieces.append(f'<row{attrs}>{new_body}</row>')
+            position = end
+    pieces.append(body[position:])
+    for new_row, cells in pending:
+        new_body = _patch_row_cells(new_row, '', cells)
+        if new_body is None:
+            return None
+        pieces.append(f'<row r="{new_row}">{new_body}</row>')
+    new_body = ''.join(pieces)
+    
+    if body_start is None:
+        patched = f'{xml[:match.start()]}<sheetData>{new_body}</sheetData>{xml[match.end():]}'
+    else:
+        patched = f'{xml[:body_start]}{new_body}{xml[match.end(1):]}'
+    
+    # Grow the stored dimension so it still covers every cell
+    dimension = _DIMENSION_RE.search(patched)
+    if dimension:
+        try:
+            min_col, min_row, max_col, max_row = range_boundaries(dimension.group(1))
+        except ValueError:
+            min_col = None
+        if min_col is not None:
+            rows_edited = [row for row, _ in edits]
+            cols_edited = [col for _, col in edits]
+            ref = (f"{get_column_letter(min(min_col, *cols_edited))}{min(min_row, *rows_edited)}:"
+                   f"{get_column_letter(max(max_col, *cols_edited))}{max(max_row, *rows_edited)}")
+            patched = f'{patched[:dimension.start(1)]}{ref}{patched[dimension.end(1):]}'
+    return patched
+
+
+def _force_full_calc(xml):
+    """
+    Ask Excel to recalculate every formula when the workbook is next opened,
+    since cached results of formulas depending on edited cells are stale.
+    """
+    match = _CALC_PR_RE.search(xml)
+    if match:
+        attrs = match.group(1)
+        if 'fullCalcOnLoad=' in attrs:
+            attrs = re.sub(r'fullCalcOnLoad="[^"]*"', 'fullCalcOnLoad="1"', attrs)
+        else:
+            attrs += ' fullCalcOnLoad="1"'
+        return f'{xml[:match.start()]}<calcPr{attrs}{match.group(2)}>{xml[match.end():]}'
+    
+    insert_at = xml.rindex('</workbook>')
+    for tag in _AFTER_CALC_PR:
+        following = re.search(rf'<{tag}\b', xml)
+        if following:
+            insert_at = following.start()
+            break
+    return f'{xml[:insert_at]}<calcPr fullCalcOnLoad="1"/>{xml[insert_at:]}'
+
+
+def _file_signature(path):
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+# Parts of a cell's formatting compared by diff, in signature order
+_FORMAT_PARTS = ("number_format", "font", "fill", "border", "alignment", "protection")
+
+
+def _format_lookup(workbook, formats):
+    """
+    Return a function mapping a cell's style array (None for an unstyled
+    cell) to a format number.
+    
+    formats maps each distinct formatting signature (number format, font,
+    fill, ...) to its number and is shared between the workbooks being
+    compared, so equal formatting gets equal numbers in both and rows compare
+    as plain tuples. Each distinct style array is resolved only once.
+    """
+    from openpyxl.styles.cell_style import StyleArray
+    from openpyxl.styles.numbers import BUILTIN_FORMATS, BUILTIN_FORMATS_MAX_SIZE
+    signatures = {}
+    
+    def format_of(style):
+        # Raw bytes hash much faster than StyleArray's tuple-based hash
+        key = style.tobytes() if style is not None else None
+        signature = signatures.get(key)
+        if signature is None:
+            style = style or StyleArray()
+            if style.numFmtId < BUILTIN_FORMATS_MAX_SIZE:
+                number_format = BUILTIN_FORMATS.get(style.numFmtId, "General")
+            else:
+                number_format = workbook._number_formats[style.numFmtId - BUILTIN_FORMATS_MAX_SIZE]
+            signature = (
+                number_format,
+                workbook._fonts[style.fontId],
+                workbook._fills[style.fillId],
+                workbook._borders[style.borderId],
+                workbook._alignments[style.alignmentId],
+                workbook._protections[style.protectionId],
+            )
+            signature = signatures[key] = formats.setdefault(signature, len(formats))
+        return signature
+    return format_of
+
+
+def _sheet_row_signatures(formula_sheet, value_sheet, format_of, default_format):
+    """
+    Reduce a sheet to {row: signature}, one tuple of (column, content, value, format) per row.
+    
+    content is what the cell holds (formula text or literal), value its
+    calculated value. Empty, unformatted cells are left out so that they
+    compare equal to cells that do not exist at all.
+    """
+    value_cells = value_sheet._cells if value_sheet is not None else {}
+    rows = {}
+    for (row, col), cell in formula_sheet._cells.items():
+        content = cell.value
+        cell_format = format_of(cell._style)
+        if content is None and cell_format == default_format:
+            continue
+        value = content
+        if isinstance(content, str) and content.startswith('='):
+            value_cell = value_cells.get((row, col))
+            value = value_cell.value if value_cell is not None else None
+        rows.setdefault(row, []).append((col, content, value, cell_format))
+    return {row: tuple(sorted(entries)) for row, entries in rows.items()}
+
+
+def _diff_row(row, old_entries, new_entries, format_signatures):
+    """
+    List the cell changes between two differing row signatures.
+    """
+    old_cells = {entry[0]: entry for entry in old_entries}
+    new_cells = {entry[0]: entry for entry in new_entries}
+    changes = []
+    for col in sorted(old_cells.keys() | new_cells.keys()):
+        old = old_cells.get(col, (col, None, None, None))
+        new = new_cells.get(col, (col, None, None, None))
+        if old == new:
+            continue
+        cell_ref = f"{get_column_letter(col)}{row}"
+        _, old_content, old_value, old_format = old
+        _, new_content, new_value, new_format = new
+        is_formula = any(isinstance(content, str) and content.startswith('=') for content in (old_content, new_content))
+        if old_content != new_content:
+            changes.append({"cell": cell_ref, "type": "formula" if is_formula else "value",
+                            "old": old_content, "new": new_content})
+        # A formula saved without a cached result (e.g. by openpyxl) has no known value
+        if is_formula and old_value != new_value and old_value is not None and new_value is not None:
+            changes.append({"cell": cell_ref, "type": "value", "old": old_value, "new": new_value})
+        if old_format is not None and new_format is not None and old_format != new_format:
+            old_format, new_format = format_signatures[old_format], format_signatures[new_format]
+            attributes = [part for part, a, b in zip(_FORMAT_PARTS, old_format, new_format) if a != b]
+            changes.append({"cell": cell_ref, "type": "format", "attributes": attributes,
+                            "old": old_format[0], "new": new_format[0]})
+    return changes
+
+
+def _diff_workbooks(old_pair, new_pair):
+    """
+    Compare two (formula workbook, data-only workbook) pairs sheet by sheet.
+    
+    Each row is reduced to a signature and rows whose signatures match are
+    skipped without looking at their cells, so the cost beyond one pass over
+    both workbooks grows with the number of changed rows.
+    """
+    old_formulas, old_values = old_pair
+    new_formulas, new_values = new_pair
+    formats = {}
+    old_format_of, new_format_of = _format_lookup(old_formulas, formats), _format_lookup(new_formulas, formats)
+    format_signatures = None
+    
+    result = {
+        "sheets_added": [name for name in new_formulas.sheetnames if name not in old_formulas.sheetnames],
+        "sheets_removed": [name for name in old_formulas.sheetnames if name not in new_formulas.sheetnames],
+        "changes": {},
+        "rows_compared": 0,
+        "rows_unchanged": 0,
+    }
+    for sheet_name in new_formulas.sheetnames:
+        if sheet_name not in old_formulas.sheetnames:
+            continue
+        old_sheet, new_sheet = old_formulas[sheet_name], new_formulas[sheet_name]
+        with _gc_paused():
+            old_rows = _sheet_row_signatures(old_sheet, old_values[sheet_name] if sheet_name in old_values.sheetnames else None,
+                                             old_format_of, old_format_of(None))
+            new_rows = _sheet_row_signatures(new_sheet, new_values[sheet_name] if sheet_name in new_values.sheetnames else None,
+                                             new_format_of, new_format_of(None))
+        
+        changes = []
+        for row in sorted(old_rows.keys() | new_rows.keys()):
+            result["rows_compared"] += 1
+            old_entries, new_entries = old_rows.get(row, ()), new_rows.get(row, ())
+            if old_entries == new_entries:
+                result["rows_unchanged"] += 1
+                continue
+            if format_signatures is None or len(format_signatures) < len(formats):
+                format_signatures = list(formats)
+            # Signatures can differ with nothing to report (a formula result only one
+            # side has cached), so such rows count as unchanged too
+            row_changes = _diff_row(row, old_entries, new_entries, format_signatures)
+            if row_changes:
+                changes.extend(row_changes)
+            else:
+                result["rows_unchanged"] += 1
+        if changes:
+            result["changes"][sheet_name] = changes
+    return result
+
+
+# File extension -> export format
+_EXPORT_FORMATS = {".csv": "csv", ".parquet": "parquet", ".arrow": "arrow", ".feather": "arrow", ".ipc": "arrow"}
+_EXPORT_EXTENSIONS = {"csv": ".csv", "parquet": ".parquet", "arrow": ".arrow"}
+
+
+def _value_kind(value):
+    """
+    Classify a cell value for choosing its column's type.
+    """
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "int"
+    if isinstance(value, float):
+        return "float"
+    if isinstance(value, datetime.datetime):
+        return "datetime"
+    if isinstance(value, datetime.date):
+        return "date"
+    return "string"
+
+
+def _column_kind(kinds):
+    """
+    Choose the type of a column from the kinds of the values in it.
+    
+    Mixed integers and floats widen to float; any other mix (or an all-empty
+    column) becomes text.
+    """
+    if len(kinds) == 1:
+        return next(iter(kinds))
+    if kinds == {"int", "float"}:
+        return "float"
+    return "string"
+
+
+def _convert_for_kind(value, kind):
+    if value is None or kind != "string":
+        return value
+    return value if isinstance(value, str) else str(value)
+
+
+# Shorthand number formats accepted by import_table
+_NUMBER_FORMATS = {
+    "currency": '"$"#,##0.00',
+    "number": "#,##0.00",
+    "integer": "#,##0",
+    "percent": "0.00%",
+    "date": "yyyy-mm-dd",
+}
+_INT_TEXT_RE = re.compile(r"^-?\d+$")
+_FLOAT_TEXT_RE = re.compile(r"^-?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][-+]?\d+)?$")
+_LEADING_ZERO_RE = re.compile(r"^-?0\d")
+
+
+def _parse_text_value(text):
+    """
+    Turn a CSV field into a number where it is plainly one, None when empty.
+    
+    Text with leading zeros ("007") stays text, like an ID would in Excel.
+    """
+    if text == '':
+        return None
+    if _LEADING_ZERO_RE.match(text):
+        return text
+    if _INT_TEXT_RE.match(text):
+        return int(text)
+    if _FLOAT_TEXT_RE.match(text):
+        return float(text)
+    return text
+
+
+def _table_source(source, header, chunk_size):
+    """
+    Return (column names or None, iterator of row tuples) for import_table.
+    
+    source is a pandas DataFrame, a path to a .csv or .parquet file, or a
+    file-like object holding CSV text.
+    """
+    if hasattr(source, "itertuples") and hasattr(source, "columns"):
+        import pandas as pd
+        names = [str(name) for name in source.columns]
+        # Only columns that actually hold NaN/NaT/NA pay for the per-value check
+        missing = [position for position in range(len(names)) if source.iloc[:, position].isna().any()]
+        if not missing:
+            return names, source.itertuples(index=False, name=None)
+        
+        def frame_rows():
+            for values in source.itertuples(index=False, name=None):
+                values = list(values)
+                for position in missing:
+                    if pd.isna(values[position]):
+                        values[position] = None
+                yield values
+        return names, frame_rows()
+    
+    if isinstance(source, (str, os.PathLike)) and os.path.splitext(source)[1].lower() == ".parquet":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Importing Parquet requires pyarrow (pip install pyarrow)") from None
+        parquet_file = pq.ParquetFile(source)
+        
+        def parquet_rows():
+            for batch in parquet_file.iter_batches(batch_size=chunk_size):
+                yield from zip(*[column.to_pylist() for column in batch.columns])
+        return list(parquet_file.schema_arrow.names), parquet_rows()
+    
+    import csv
+    import io
+    if isinstance(source, (str, os.PathLike)):
+        stream = open(source, newline="", encoding="utf-8-sig")
+    elif isinstance(source.read(0), bytes):
+        stream = io.TextIOWrapper(source, encoding="utf-8-sig", newline="")
+    else:
+        stream = source
+    reader = csv.reader(stream)
+    names = next(reader, None) if header else None
+    
+    def csv_rows():
+        try:
+            for fields in reader:
+                yield tuple(_parse_text_value(field) for field in fields)
+        finally:
+            if stream is not source:
+                stream.close()
+    return names, csv_rows()
+
+
+class _CsvExportWriter:
+    def __init__(self, path, names, kinds):
+        import csv
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(names)
+    
+    def write(self, columns):
+        self._writer.writerows(zip(*[['' if value is None else value for value in column] for column in columns]))
+    
+    def close(self):
+        self._file.close()
+
+
+class _ArrowExportWriter:
+    """
+    Writes record batches to a Parquet file or an Arrow IPC file.
+    """
+    
+    def __init__(self, path, names, kinds, format):
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError(f"Exporting to {format} requires pyarrow (pip install pyarrow)") from None
+        types = {"int": pa.int64(), "float": pa.float64(), "bool": pa.bool_(),
+                 "datetime": pa.timestamp("us"), "date": pa.date32(), "string": pa.string()}
+        self._pa = pa
+        self._schema = pa.schema([(name, types[kind]) for name, kind in zip(names, kinds)])
+        if format == "parquet":
+            import pyarrow.parquet as pq
+            self._sink = None
+            self._writer = pq.ParquetWriter(path, self._schema)
+        else:
+            self._sink = pa.OSFile(path, "wb")
+            self._writer = pa.ipc.new_file(self._sink, self._schema)
+    
+    def write(self, columns):
+        pa = self._pa
+        arrays = [pa.array(column, type=field.type) for column, field in zip(columns, self._schema)]
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self._schema))
+    
+    def close(self):
+        self._writer.close()
+        if self._sink is not None:
+            self._sink.close()
+
+
+def _number_format_style(workbook, number_format):
+    """
+    Return a style array carrying number_format in workbook, for cells created directly.
+    """
+    from openpyxl.styles.cell_style import StyleArray
+    from openpyxl.styles.numbers import BUILTIN_FORMATS_MAX_SIZE, BUILTIN_FORMATS_REVERSE
+    style = StyleArray()
+    if number_format in BUILTIN_FORMATS_REVERSE:
+        style.numFmtId = BUILTIN_FORMATS_REVERSE[number_format]
+    else:
+        style.numFmtId = workbook._number_formats.add(number_format) + BUILTIN_FORMATS_MAX_SIZE
+    return style
+
+
+# Reader backends by file extension: extension -> (load(path, data_only), read_only)
+_READER_BACKENDS = {}
+
+
+def register_reader_backend(extensions, load, read_only=True):
+    """
+    Make excelManager read files with the given extension(s) through load.
+    
+    load(path, data_only) must return an openpyxl Workbook; data_only asks for
+    calculated values instead of formulas, and backends that only know
+    values may ignore it. Workbooks from a read_only backend can be read,
+    searched, compared and exported, but not edited or saved. Registering an
+    extension again replaces its backend.
+    """
+    if isinstance(extensions, str):
+        extensions = [extensions]
+    for extension in extensions:
+        extension = extension.lower()
+        _READER_BACKENDS[extension if extension.startswith('.') else f".{extension}"] = (load, read_only)
+
+
+def _reader_backend(path):
+    """
+    Return (load, read_only) for path, defaulting to openpyxl for unknown extensions.
+    """
+    return _READER_BACKENDS.get(os.path.splitext(path)[1].lower(), _READER_BACKENDS[".xlsx"])
+
+
+def _load_openpyxl(path, data_only):
+    from openpyxl import load_workbook
+    return load_workbook(path, data_only=data_only)
+
+
+def _plain_number(value):
+    # Binary formats store every number as a float; give whole numbers back as int like openpyxl does
+    return int(value) if value.is_integer() else value
+
+
+def _load_xls(path, data_only):
+    """
+    Read a legacy .xls (BIFF) file with xlrd into an openpyxl Workbook.
+    
+    .xls files store the calculated value of each formula, which is what
+    is read; number formats are kept so currency formatting still applies.
+    """
+    try:
+        import xlrd
+    except ImportError:
+        raise ImportError("Reading .xls files requires xlrd (pip install xlrd)") from None
+    from openpyxl import Workbook
+    from openpyxl.cell.cell import Cell
+    
+    book = xlrd.open_workbook(path, formatting_info=True, on_demand=True)
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    styles = {}  # xf index -> style array (None for General)
+    
+    def style_of(xf_index):
+        if xf_index not in styles:
+            number_format = book.format_map[book.xf_list[xf_index].format_key].format_str
+            styles[xf_index] = _number_format_style(workbook, number_format) if number_format != "General" else None
+        return styles[xf_index]
+    
+    for index in range(book.nsheets):
+        source = book.sheet_by_index(index)
+        sheet = workbook.create_sheet(source.name)
+        cells = sheet._cells
+        for row in range(source.nrows):
+            types, values = source.row_types(row), source.row_values(row)
+            for col, (cell_type, value) in enumerate(zip(types, values)):
+                if cell_type in (xlrd.XL_CELL_EMPTY, xlrd.XL_CELL_BLANK):
+                    continue
+                if cell_type == xlrd.XL_CELL_NUMBER:
+                    value = _plain_number(value)
+                elif cell_type == xlrd.XL_CELL_DATE:
+                    value = xlrd.xldate_as_datetime(value, book.datemode)
+                elif cell_type == xlrd.XL_CELL_BOOLEAN:
+                    value = bool(value)
+                elif cell_type == xlrd.XL_CELL_ERROR:
+                    value = xlrd.error_text_from_code.get(value, "#N/A")
+                cells[(row + 1, col + 1)] = Cell(sheet, row=row + 1, column=col + 1, value=value,
+                                                 style_array=style_of(source.cell_xf_index(row, col)))
+        book.unload_sheet(index)
+    book.release_resources()
+    return workbook
+
+
+def _load_xlsb(path, data_only):
+    """
+    Read a binary .xlsb file with pyxlsb into an openpyxl Workbook.
+    
+    pyxlsb streams the calculated values only: formulas and number formats
+    are not available, so dates come back as Excel serial numbers.
+    """
+    try:
+        from pyxlsb import open_workbook
+    except ImportError:
+        raise ImportError("Reading .xlsb files requires pyxlsb (pip install pyxlsb)") from None
+    from openpyxl import Workbook
+    from openpyxl.cell.cell import Cell
+    
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    with open_workbook(path) as book:
+        for name in book.sheets:
+            sheet = workbook.create_sheet(name)
+            cells = sheet._cells
+            with book.get_sheet(name) as source:
+                for source_row in source.rows(sparse=True):
+                    for item in source_row:
+                        value = item.v
+                        if value is None:
+                            continue
+                        if isinstance(value, float):
+                            value = _plain_number(value)
+                        cells[(item.r + 1, item.c + 1)] = Cell(sheet, row=item.r + 1, column=item.c + 1, value=value)
+    return workbook
+
+
+register_reader_backend([".xlsx", ".xlsm", ".xltx", ".xltm"], _load_openpyxl, read_only=False)
+register_reader_backend(".xls", _load_xls)
+register_reader_backend(".xlsb", _load_xlsb)
+
 
 class excelManager:
-    def __init__(self, file_path=None):
+    def __init__(self, file_path=None, save_delay=0.25, instrument=False, read_only=False):
         """
         Initialize the ExcelManager with an optional file path.
         If no file path is provided, operations will require a file path.
+        
+        read_only=True opens an existing file for reading only (see load_workbook).
+        save_delay is how long (in seconds) save_async waits before writing,
+        so that saves requested close together are coalesced into one.
+        instrument=True turns on statistics collection from the start
+        (see enable_instrumentation).
         """
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
+        # Per-method call counts, logged as one summary line instead of a line per cell
+        self._call_counts = Counter()
+        self._call_counts_lock = threading.Lock()
+        # Opt-in latency/volume statistics, see enable_instrumentation
+        self._instrumentation = _Instrumentation() if instrument else None
+        # Guards workbook/formula_workbook: reads share it, writes and saves are exclusive
+        self._lock = _ReadWriteLock()
         self.file_path = file_path
         self.workbook = None
         self.formula_workbook = None
         
-        if file_path and os.path.exists(file_path):
-            self.load_workbook(file_path)
-            self.logger.info(f"Initialized ExcelManager with existing file: {file_path}")
+        # Write-behind save state; _revision counts edits so a background save
+        # can tell whether the workbook changed after it took its snapshot
+        self.save_delay = save_delay
+        self._revision = 0
+        self._generation = 0  # bumped whenever the workbook pair is replaced
+        self._document = 0  # bumped when load_workbook/create_workbook switch to another document
+        self._save_mutex = threading.Lock()
+        self._save_executor = None
+        self._pending_saves = {}  # (path, document) -> Future not yet picked up by the worker
+        self._save_futures = set()
+        
+        # Change tracking for delta saves: the file the in-memory workbook was
+        # last loaded from or saved to, and the cells edited since then
+        self._source_path = None
+        self._source_signature = None
+        self._dirty_cells = {}  # sheet name -> {(row, column)}
+        self._structure_dirty = True
+        
+        # Set when the workbook came from a read-only reader backend (.xls, .xlsb)
+        self._read_only = False
+        
+        # Per-sheet extent of the data-only workbook, see _data_extent
+        self._extent_cache = {}
+        
+        # Value/word index for find and search, built on first use
+        self._search_index = None
+        self._search_index_lock = threading.Lock()
+        
+        if file_path and (read_only or os.path.exists(file_path)):
+            self.load_workbook(file_path, read_only=read_only)
+            self.logger.info("Initialized ExcelManager with existing file: %s", file_path)
         elif file_path:
             self.create_workbook(file_path)
-            self.logger.info(f"Initialized ExcelManager with new file: {file_path}")
+            self.logger.info("Initialized ExcelManager with new file: %s", file_path)
         else:
             self.logger.info("Initialized ExcelManager without a file")
     
+    def _count_call(self, name):
+        with self._call_counts_lock:
+            self._call_counts[name] += 1
+    
+    def get_call_counts(self):
+        """
+        Return the number of calls made to each public method since the last summary.
+        """
+        with self._call_counts_lock:
+            return dict(self._call_counts)
+    
+    def log_call_summary(self, reset=True):
+        """
+        Log the per-method call counts as a single INFO record.
+        
+        Called automatically on save and close.
+        """
+        with self._call_counts_lock:
+            counts = dict(self._call_counts)
+            if reset:
+                self._call_counts.clear()
+        if counts and self.logger.isEnabledFor(logging.INFO):
+            summary = ", ".join(f"{name}={count}" for name, count in sorted(counts.items()))
+            self.logger.info("Call counts for %s: %s", self.file_path, summary)
+    
+    def enable_instrumentation(self):
+        """
+        Start collecting per-method latency histograms and volume counters
+        (cells read/written, bytes read/written, workbook loads).
+        
+        Instrumentation is off by default and costs a single attribute check
+        per call while disabled.
+        """
+        if self._instrumentation is None:
+            self._instrumentation = _Instrumentation()
+        self.logger.info("Enabled instrumentation")
+    
+    def disable_instrumentation(self):
+        """
+        Stop collecting statistics and discard those collected so far.
+        """
+        self._instrumentation = None
+        self.logger.info("Disabled instrumentation")
+    
+    @property
+    def read_only(self):
+        """
+        True when the workbook was loaded with read_only=True or from a format
+        that can't be written (.xls, .xlsb).
+        """
+        return self._read_only
+    
+    def _check_save_target(self, path):
+        """
+        Refuse to save to a format that can only be read (a workbook loaded
+        from one can still be saved as .xlsx, which makes it editable), or a
+        read-only workbook over the file it came from.
+        """
+        if _reader_backend(path)[1]:
+            self.logger.error("Cannot save to a read-only format: %s", path)
+            raise ValueError(f"Cannot save to a read-only format: {path}")
+        # A read-only workbook holds values without formulas; never write that over its source
+        if self._read_only and self._source_path and os.path.abspath(path) == os.path.abspath(self._source_path):
+            self.logger.error("Cannot save a read-only workbook over its source: %s", path)
+            raise ValueError(f"Cannot save a read-only workbook over its source: {path}")
+    
+    def _check_writable(self):
+        if self._read_only:
+            self.logger.error("Workbook is read-only: %s", self.file_path)
+            raise ValueError(f"Workbook is read-only: {self.file_path}; save a copy as .xlsx to edit it")
+    
+    @property
+    def version(self):
+        """
+        A token that changes whenever what the read methods return may have
+        changed (edits, loads, saves). Compare it for equality, e.g. to key
+        caches of read results.
+        """
+        return self._generation, self._revision
+    
+    @property
+    def instrumentation_enabled(self):
+        return self._instrumentation is not None
+    
+    def get_stats(self):
+        """
+        Return a snapshot of the collected statistics.
+        
+        The result has "methods" and "spans" (name -> count, total/mean/max
+        seconds and cumulative latency buckets) and "counters". Returns None
+        when instrumentation is disabled.
+        """
+        instrumentation = self._instrumentation
+        return instrumentation.snapshot() if instrumentation is not None else None
+    
+    def reset_stats(self):
+        """
+        Clear the collected statistics.
+        """
+        if self._instrumentation is not None:
+            self._instrumentation.reset()
+    
+    @contextmanager
+    def span(self, name):
+        """
+        Time a block of caller code, e.g. a whole UI action:
+        
+            with excel.span("upload"):
+                ...
+        
+        Recorded under "spans" in get_stats(); a no-op when instrumentation is disabled.
+        """
+        instrumentation = self._instrumentation
+        if instrumentation is None:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            instrumentation.observe("spans", name, time.perf_counter() - start)
+    
+    def export_stats(self, path=None, format="json"):
+        """
+        Render the collected statistics as "json" or "prometheus" text.
+        
+        If a path is given the text is also written to that file. Returns the text.
+        """
+        if self._instrumentation is None:
+            self.logger.error("Instrumentation is not enabled")
+            raise ValueError("Instrumentation is not enabled")
+        
+        if format == "json":
+            import json
+            text = json.dumps(self._instrumentation.snapshot(), indent=2)
+        elif format == "prometheus":
+            text = self._instrumentation.to_prometheus()
+        else:
+            self.logger.error("Unsupported stats format: %s", format)
+            raise ValueError(f"Unsupported stats format: {format}")
+        
+        if path:
+            with open(path, "w") as f:
+                f.write(text)
+            self.logger.info("Exported stats to %s", path)
+        return text
+    
+    def _record(self, counter, amount=1):
+        instrumentation = self._instrumentation
+        if instrumentation is not None:
+            instrumentation.add(counter, amount)
+    
+    def _load(self, path, data_only):
+        """
+        Load one workbook from disk through the reader backend registered for
+        its extension, accounting for it in the statistics.
+        """
+        load, _ = _reader_backend(path)
+        workbook = load(path, data_only)
+        if self._instrumentation is not None:
+            self._record("workbook_loads")
+            self._record("bytes_read", os.path.getsize(path))
+        return workbook
+    
+    @_writes
     def create_workbook(self, file_path=None):
         """
         Create a new Excel workbook.
@@ -46,17 +1504,25 @@ class excelManager:
             self.logger.error("No file path provided")
             raise ValueError("File path is required to create a workbook")
         
-        self.workbook = Workbook()
-        # Create a separate workbook for formulas
-        self.formula_workbook = Workbook()
+        from openpyxl import Workbook
+        # Create the formula workbook and a separate workbook for calculated values
+        self._set_workbooks(Workbook(), Workbook())
+        self._document += 1
         self.file_path = path
+        # A brand new workbook has no file to patch, so the first save is a full one
+        self._structure_dirty = True
         self.save()
-        self.logger.info(f"Created new workbook at {path}")
+        self.logger.info("Created new workbook at %s", path)
         return self.workbook
     
-    def load_workbook(self, file_path=None):
+    @_writes
+    def load_workbook(self, file_path=None, read_only=False):
         """
         Load an existing Excel workbook.
+        
+        With read_only=True only the calculated values are loaded, once
+        instead of twice, which roughly halves the load time when the
+        workbook is only going to be read (e.g. to generate reports).
         """
         path = file_path or self.file_path
         if not path:
@@ -64,16 +1530,26 @@ class excelManager:
             raise ValueError("File path is required to load a workbook")
         
         if not os.path.exists(path):
-            self.logger.error(f"File does not exist: {path}")
+            self.logger.error("File does not exist: %s", path)
             raise FileNotFoundError(f"File does not exist: {path}")
         
-        # Load two versions of the workbook - one with formulas and one with calculated values
-        self.formula_workbook = load_workbook(path, data_only=False)
-        self.workbook = load_workbook(path, data_only=True)
+        # Load two versions of the workbook - one with formulas and one with calculated values.
+        # A read-only workbook can't change, so one copy of the values serves as both
+        read_only = read_only or _reader_backend(path)[1]
+        formula_workbook = self._load(path, data_only=read_only)
+        workbook = formula_workbook if read_only else self._load(path, data_only=True)
+        # Swap the pair in together so readers never see a mismatched pair
+        self._set_workbooks(formula_workbook, workbook, read_only)
+        self._document += 1
         self.file_path = path
-        self.logger.info(f"Loaded workbook from {path}")
+        self._mark_clean(path)
+        if read_only:
+            # There is no zip package to patch, so a save as .xlsx has to be a full one
+            self._structure_dirty = True
+        self.logger.info("Loaded workbook from %s", path)
         return self.workbook
     
+    @_writes
     def save(self, file_path=None):
         """
         Save the workbook to disk.
@@ -86,29 +1562,305 @@ class excelManager:
         if not path:
             self.logger.error("No file path provided")
             raise ValueError("File path is required to save a workbook")
+        self._check_save_target(path)
         
         # Always save the formula workbook as it contains both formulas and structure
-        self.formula_workbook.save(path)
+        delta = self._write_file(path)
         self.file_path = path
         
-        # Reload both workbooks to keep them in sync
-        self.formula_workbook = load_workbook(path, data_only=False)
-        self.workbook = load_workbook(path, data_only=True)
+        # Reload both workbooks to keep them in sync, swapping the pair in together.
+        # After a delta save the formula workbook already matches the file.
+        formula_workbook = self.formula_workbook if delta else self._load(path, data_only=False)
+        workbook = self._load(path, data_only=True)
+        self._set_workbooks(formula_workbook, workbook)
+        
+        self.logger.info("Saved workbook to %s", path)
+        self.log_call_summary()
+    
+    def save_async(self, file_path=None):
+        """
+        Save the workbook to disk on a background thread (write-behind).
+        
+        Saves to the same path requested within save_delay seconds of each other
+        are coalesced into a single write and share the returned Future, which
+        resolves to the saved path once the file is on disk (or raises the error
+        that made the save fail). Use flush() to wait for all pending saves.
+        
+        The save belongs to the workbook loaded when it was requested: if
+        load_workbook or create_workbook switches to another document before
+        it runs, nothing is written and the Future raises ValueError.
+        """
+        if not self.formula_workbook:
+            self.logger.error("No workbook loaded")
+            raise ValueError("No workbook loaded")
+        
+        path = file_path or self.file_path
+        if not path:
+            self.logger.error("No file path provided")
+            raise ValueError("File path is required to save a workbook")
+        self._check_save_target(path)
+        
+        key = (path, self._document)
+        with self._save_mutex:
+            future = self._pending_saves.get(key)
+            if future is not None:
+                self.logger.info("Coalesced save request for %s", path)
+                return future
+            
+            future = Future()
+            self._pending_saves[key] = future
+            self._save_futures.add(future)
+            future.add_done_callback(self._forget_save)
+            if self._save_executor is None:
+                self._save_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="excel-save")
+            self._save_executor.submit(self._run_background_save, key, future)
+        
+        self.logger.info("Queued background save to %s", path)
+        return future
+    
+    def flush(self, timeout=None):
+        """
+        Wait for queued background saves to finish.
+        
+        Returns True if all saves completed within the timeout.
+        """
+        with self._save_mutex:
+            futures = list(self._save_futures)
+        if not futures:
+            return True
+        _, not_done = wait(futures, timeout=timeout)
+        return not not_done
+    
+    def _forget_save(self, future):
+        with self._save_mutex:
+            self._save_futures.discard(future)
+    
+    def _run_background_save(self, key, future):
+        """
+        Worker body for save_async: wait out the coalescing window, then snapshot and write.
+        """
+        path, document = key
+        time.sleep(self.save_delay)
+        with self._save_mutex:
+            # From here on, new requests queue a fresh save behind this one
+            self._pending_saves.pop(key, None)
+        if not future.set_running_or_notify_cancel():
+            return
+        
+        try:
+            # Serializing only reads the workbook, so readers keep going while writers wait.
+            # _write_file still records the file as the clean baseline in here; that is
+            # safe because everything that marks the workbook dirty takes the write lock
+            with self._lock.read():
+                if not self.formula_workbook:
+                    raise ValueError("No workbook loaded")
+                # Never write another document's content (or drop this one's edits) under this path
+                if self._document != document:
+                    raise ValueError(f"Workbook was replaced before the background save to {path} ran")
+                revision = self._revision
+                delta = self._write_file(path)
+                formula_workbook = self.formula_workbook if delta else None
+            
+            if formula_workbook is None:
+                formula_workbook = self._load(path, data_only=False)
+            workbook = self._load(path, data_only=True)
+            with self._lock.write():
+                # Edits made after the snapshot live only in memory, and a document
+                # loaded since is none of this save's business; keep both
+                if self._document == document:
+                    if self._revision == revision:
+                        self._set_workbooks(formula_workbook, workbook)
+                    self.file_path = path
+        except Exception as e:
+            self.logger.error("Background save to %s failed: %s", path, e)
+            future.set_exception(e)
+        else:
+            self.logger.info("Saved workbook to %s (background)", path)
+            self.log_call_summary()
+            future.set_result(path)
+    
+    def _write_file(self, path):
+        """
+        Serialize the formula workbook to path atomically.
+        
+        The workbook is written to a temporary file in the same directory and
+        then renamed over the target, so a crash mid-save never leaves a
+        truncated workbook behind. When only cell values changed since the
+        workbook was loaded, only the edited worksheet parts are rewritten
+        (see _write_delta).
         
-        self.logger.info(f"Saved workbook to {path}")
+        Returns True if the file was written as a delta.
+        """
+        directory, name = os.path.split(os.path.abspath(path))
+        temp_path = os.path.join(directory, f".~{name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            delta = self._can_write_delta() and self._write_delta(temp_path)
+            if not delta:
+                self.formula_workbook.save(temp_path)
+            if os.path.exists(path):
+                shutil.copymode(path, temp_path)
+            os.replace(temp_path, path)
+            if self._instrumentation is not None:
+                self._record("bytes_written", os.path.getsize(path))
+                self._record("delta_saves" if delta else "full_saves")
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        
+        self._mark_clean(path)
+        return delta
+    
+    def _set_workbooks(self, formula_workbook, workbook, read_only=False):
+        """
+        Swap in a new formula/data-only workbook pair and drop state derived from the old one.
+        """
+        self.formula_workbook, self.workbook = formula_workbook, workbook
+        self._read_only = read_only
+        self._generation += 1
+        self._extent_cache = {}
+        self._search_index = None
+    
+    def _mark_clean(self, path):
+        """
+        Record path as the on-disk baseline of the in-memory workbook.
+        """
+        self._source_path = path
+        self._source_signature = _file_signature(path)
+        self._dirty_cells = {}
+        self._structure_dirty = False
+    
+    def _mark_dirty(self, sheet_name, row, col):
+        self._dirty_cells.setdefault(sheet_name, set()).add((row, col))
+    
+    def _index_write(self, sheet_name, row, col, value):
+        """
+        Keep the search index (if built) in step with a cell write.
+        
+        A formula's result is unknown until the workbook is saved and
+        reloaded, so the cell is left out of the index until then.
+        """
+        index = self._search_index
+        if index is None:
+            return
+        if isinstance(value, str) and value.startswith('='):
+            index.remove((sheet_name, row, col))
+        else:
+            index.update((sheet_name, row, col), value)
+    
+    def _can_write_delta(self):
+        """
+        A delta save needs an unchanged baseline file and edits limited to cell values.
+        """
+        import zipfile
+        if self._structure_dirty or not self._source_path:
+            return False
+        try:
+            return (_file_signature(self._source_path) == self._source_signature
+                    and zipfile.is_zipfile(self._source_path))
+        except OSError:
+            return False
+    
+    def _write_delta(self, target_path):
+        """
+        Write target_path as a copy of the baseline file with only the edited cells rewritten.
+        
+        The worksheet parts of edited sheets are patched in place, the workbook
+        part is flagged for a full recalculation on open and the (now stale)
+        calculation chain is dropped. Formula cells on every sheet lose their
+        cached results, since any of them may depend on the edited cells.
+        Everything else (styles, shared strings, sheets without formulas,
+        themes...) is copied across unchanged instead of being regenerated by
+        openpyxl.
+        
+        Returns False without writing anything if an edit cannot be expressed
+        as a patch; the caller then falls back to a full save.
+        """
+        import zipfile
+        import xml.etree.ElementTree as ET
+        with zipfile.ZipFile(self._source_path) as source:
+            try:
+                sheet_parts = _sheet_part_names(source)
+                workbook_part = _workbook_part_name(source)
+            except (KeyError, ET.ParseError):
+                return False
+            
+            patched = {}
+            for sheet_name, cells in self._dirty_cells.items():
+                part = sheet_parts.get(sheet_name)
+                if part is None or sheet_name not in self.formula_workbook.sheetnames:
+                    return False
+                sheet = self.formula_workbook[sheet_name]
+                edits = {}
+                for row, col in cells:
+                    cell = sheet._cells.get((row, col))
+                    edits[(row, col)] = cell.value if cell is not None else None
+                xml = _patch_sheet_xml(source.read(part).decode("utf-8"), edits)
+                if xml is None:
+                    return False
+                patched[part] = _drop_formula_values(xml).encode("utf-8")
+            
+            # A formula on an untouched sheet may depend on the edited cells, so its
+            # cached result has to go too; sheets without formulas are copied as they are
+            if patched:
+                for part in sheet_parts.values():
+                    if part in patched:
+                        continue
+                    xml = source.read(part).decode("utf-8")
+                    if _FORMULA_RE.search(xml):
+                        patched[part] = _drop_formula_values(xml).encode("utf-8")
+            
+            dropped = set()
+            if patched:
+                patched[workbook_part] = _force_full_calc(source.read(workbook_part).decode("utf-8")).encode("utf-8")
+                
+                rels_part = _rels_part_name(workbook_part)
+                rels = source.read(rels_part).decode("utf-8")
+                calc_chain = re.search(r'<Relationship\b[^>]*Type="[^"]*/calcChain"[^>]*/>', rels)
+                if calc_chain:
+                    target = re.search(r'Target="([^"]*)"', calc_chain.group(0)).group(1)
+                    calc_chain_part = _resolve_target(workbook_part, target)
+                    dropped.add(calc_chain_part)
+                    patched[rels_part] = rels.replace(calc_chain.group(0), "").encode("utf-8")
+                    content_types = source.read("[Content_Types].xml").decode("utf-8")
+                    content_types = re.sub(rf'<Override\b[^>]*PartName="/{re.escape(calc_chain_part)}"[^>]*/>', "", content_types)
+                    patched["[Content_Types].xml"] = content_types.encode("utf-8")
+            
+            with zipfile.ZipFile(target_path, "w", zipfile.ZIP_DEFLATED) as target:
+                for info in source.infolist():
+                    if info.filename in dropped:
+                        continue
+                    if info.filename in patched:
+                        target.writestr(info, patched[info.filename])
+                        continue
+                    with source.open(info) as src, target.open(info, "w") as dst:
+                        shutil.copyfileobj(src, dst)
+        
+        self.logger.info("Delta save rewrote %s of %s parts", len(patched), len(source.infolist()))
+        return True
     
     def close(self):
         """
         Close the workbook.
+        
+        Pending background saves are allowed to finish first.
         """
-        if self.workbook:
-            self.workbook.close()
-            self.workbook = None
-        if self.formula_workbook:
-            self.formula_workbook.close()
-            self.formula_workbook = None
+        self.flush()
+        with self._lock.write():
+            if self.workbook:
+                self.workbook.close()
+                self.workbook = None
+            if self.formula_workbook:
+                self.formula_workbook.close()
+                self.formula_workbook = None
+        with self._save_mutex:
+            if self._save_executor is not None:
+                self._save_executor.shutdown(wait=False)
+                self._save_executor = None
+        self.log_call_summary()
         self.logger.info("Closed workbook")
     
+    @_reads
     def count_sheets(self):
         """
         Return the number of sheets in the workbook.
@@ -118,9 +1870,10 @@ class excelManager:
             raise ValueError("No workbook loaded")
         
         count = len(self.formula_workbook.sheetnames)
-        self.logger.info(f"Counted {count} sheets")
+        self.logger.debug("Counted %s sheets", count)
         return count
     
+    @_reads
     def get_sheet_names(self):
         """
         Return the names of the sheets in the workbook.
@@ -130,9 +1883,10 @@ class excelManager:
             raise ValueError("No workbook loaded")
         
         names = self.formula_workbook.sheetnames
-        self.logger.info(f"Retrieved sheet names: {names}")
+        self.logger.debug("Retrieved sheet names: %s", names)
         return names
     
+    @_writes
     def create_sheet(self, sheet_name):
         """
         Create a new sheet in the workbook.
@@ -140,34 +1894,48 @@ class excelManager:
         if not self.formula_workbook:
             self.logger.error("No workbook loaded")
             raise ValueError("No workbook loaded")
+        self._check_writable()
         
         if sheet_name in self.formula_workbook.sheetnames:
-            self.logger.warning(f"Sheet {sheet_name} already exists")
+            self.logger.warning("Sheet %s already exists", sheet_name)
             return self.formula_workbook[sheet_name]
         
         # Create sheet in both workbooks
         formula_sheet = self.formula_workbook.create_sheet(sheet_name)
         value_sheet = self.workbook.create_sheet(sheet_name)
+        self._revision += 1
+        self._structure_dirty = True
         
-        self.logger.info(f"Created new sheet: {sheet_name}")
+        self.logger.info("Created new sheet: %s", sheet_name)
         return formula_sheet
     
+    @_writes
     def get_sheet(self, sheet_name):
         """
         Get a sheet by name.
+        
+        Runs exclusively: handing out the sheet marks the workbook for a full
+        save, which must not interleave with a background save recording the
+        file it just wrote as clean.
         """
         if not self.formula_workbook:
             self.logger.error("No workbook loaded")
             raise ValueError("No workbook loaded")
         
         if sheet_name not in self.formula_workbook.sheetnames:
-            self.logger.error(f"Sheet does not exist: {sheet_name}")
+            self.logger.error("Sheet does not exist: %s", sheet_name)
             raise ValueError(f"Sheet does not exist: {sheet_name}")
         
         formula_sheet = self.formula_workbook[sheet_name]
-        self.logger.info(f"Retrieved sheet: {sheet_name}")
+        # The caller can now change the sheet directly, which bypasses the
+        # per-cell change tracking, so the next save has to be a full one
+        # and the search index can no longer be trusted
+        self._structure_dirty = True
+        self._search_index = None
+        self.logger.debug("Retrieved sheet: %s", sheet_name)
         return formula_sheet
     
+    @_writes
     def delete_sheet(self, sheet_name):
         """
         Delete a sheet by name.
@@ -175,43 +1943,92 @@ class excelManager:
         if not self.formula_workbook:
             self.logger.error("No workbook loaded")
             raise ValueError("No workbook loaded")
+        self._check_writable()
         
         if sheet_name not in self.formula_workbook.sheetnames:
-            self.logger.error(f"Sheet does not exist: {sheet_name}")
+            self.logger.error("Sheet does not exist: %s", sheet_name)
             raise ValueError(f"Sheet does not exist: {sheet_name}")
         
         # Delete from both workbooks
         del self.formula_workbook[sheet_name]
         if sheet_name in self.workbook.sheetnames:
             del self.workbook[sheet_name]
+        self._extent_cache.pop(sheet_name, None)
+        if self._search_index is not None:
+            self._search_index.remove_sheet(sheet_name)
+        self._revision += 1
+        self._structure_dirty = True
             
-        self.logger.info(f"Deleted sheet: {sheet_name}")
+        self.logger.info("Deleted sheet: %s", sheet_name)
     
     def _parse_cell_reference(self, cell_reference, current_sheet_name=None):
         """
         Parse a cell reference and return the sheet name, row, and column.
         
         Examples:
-        - A1: same sheet, row 1, column 1
+        - A1 or $A$1: same sheet, row 1, column 1
         - Sheet2!B3: Sheet2, row 3, column 2
+        - 'Q1!Plan'!B3: sheet "Q1!Plan", row 3, column 2
+        - Budget: the single cell a defined name points to
         """
-        sheet_name = current_sheet_name
-        
-        # Check if the reference includes a sheet name
-        if '!' in cell_reference:
-            parts = cell_reference.split('!')
-            sheet_name = parts[0].strip("'")
-            cell_reference = parts[1]
-        
-        # Convert A1 reference to row, column
-        try:
-            column_letter, row = coordinate_from_string(cell_reference)
-            column = column_index_from_string(column_letter)
-        except Exception as e:
-            self.logger.error(f"Invalid cell reference: {cell_reference}. Error: {e}")
+        sheet_name, min_row, min_col, max_row, max_col = self._resolve_reference(cell_reference, current_sheet_name)
+        if min_row != max_row or min_col != max_col:
+            self.logger.error("Not a single cell reference: %s", cell_reference)
             raise ValueError(f"Invalid cell reference: {cell_reference}")
+        return sheet_name, min_row, min_col
+    
+    def _resolve_reference(self, reference, current_sheet_name=None):
+        """
+        Resolve a cell, range, whole-column/row or defined-name reference to
+        (sheet name, min_row, min_col, max_row, max_col).
         
-        return sheet_name, row, column
+        Open ends of whole columns and rows are bounded by the sheet's data extent.
+        """
+        try:
+            sheet_name, name, min_row, min_col, max_row, max_col = _parse_reference(reference)
+        except ValueError as e:
+            self.logger.error("Invalid cell reference: %s. Error: %s", reference, e)
+            raise
+        if sheet_name is None:
+            sheet_name = current_sheet_name
+        
+        if name is not None:
+            sheet_name, min_row, min_col, max_row, max_col = self._resolve_defined_name(name, sheet_name)
+        
+        if min_row is None or min_col is None:
+            if sheet_name not in self.workbook.sheetnames:
+                self.logger.error("Sheet does not exist: %s", sheet_name)
+                raise ValueError(f"Sheet does not exist: {sheet_name}")
+            extent_rows, extent_cols, _ = self._data_extent(sheet_name)
+            if min_row is None:
+                min_row, max_row = 1, max(extent_rows, 1)
+            if min_col is None:
+                min_col, max_col = 1, max(extent_cols, 1)
+        return sheet_name, min_row, min_col, max_row, max_col
+    
+    def _resolve_defined_name(self, name, sheet_name=None):
+        """
+        Look up a defined name (sheet-scoped first, then workbook-scoped) and
+        return the single range it points to.
+        """
+        defined_name = None
+        if sheet_name in self.formula_workbook.sheetnames:
+            sheet_names = getattr(self.formula_workbook[sheet_name], "defined_names", None)
+            if sheet_names:
+                defined_name = sheet_names.get(name)
+        if defined_name is None:
+            defined_name = self.formula_workbook.defined_names.get(name)
+        if defined_name is None:
+            self.logger.error("Invalid cell reference or unknown defined name: %s", name)
+            raise ValueError(f"Invalid cell reference: {name}")
+        
+        destinations = list(defined_name.destinations)
+        if len(destinations) != 1:
+            self.logger.error("Defined name %s does not refer to a single range", name)
+            raise ValueError(f"Defined name does not refer to a single range: {name}")
+        target_sheet, target_range = destinations[0]
+        _, _, min_row, min_col, max_row, max_col = _parse_reference(target_range)
+        return target_sheet, min_row, min_col, max_row, max_col
     
     def _format_numeric_value(self, value, is_currency=False):
         """
@@ -236,6 +2053,47 @@ class excelManager:
         
         return value
     
+    def _cell_value(self, sheet, row, col):
+        """
+        Return the value of a cell without creating it.
+        
+        sheet.cell() allocates a Cell for every coordinate it is asked about, so
+        probing empty regions with it grows the sheet; this only looks up
+        cells that already exist.
+        """
+        cell = sheet._cells.get((row, col))
+        return cell.value if cell is not None else None
+    
+    def _is_currency(self, sheet_name, row, col):
+        """
+        Check whether a cell is formatted as currency, without creating it.
+        """
+        formula_cell = self.formula_workbook[sheet_name]._cells.get((row, col))
+        return bool(formula_cell is not None and formula_cell.number_format and '$' in formula_cell.number_format)
+    
+    def _data_extent(self, sheet_name):
+        """
+        Return (max_row, max_column, {column: max_row}) for the non-empty cells
+        of a sheet in the data-only workbook.
+        
+        sheet.max_row/max_column also count cells that only carry formatting,
+        which can push them to row 1,048,576. The extent is cached until the
+        workbooks are reloaded.
+        """
+        extent = self._extent_cache.get(sheet_name)
+        if extent is None:
+            column_rows = {}
+            for (row, col), cell in self.workbook[sheet_name]._cells.items():
+                value = cell.value
+                if value is None or value == '':
+                    continue
+                if row > column_rows.get(col, 0):
+                    column_rows[col] = row
+            extent = (max(column_rows.values(), default=0), max(column_rows, default=0), column_rows)
+            self._extent_cache[sheet_name] = extent
+        return extent
+    
+    @_reads
     def read_cell(self, sheet_name, row_or_cell, column=None):
         """
         Read a cell value. 
@@ -265,31 +2123,34 @@ class excelManager:
             col = column
         
         if sheet_name not in self.workbook.sheetnames:
-            self.logger.error(f"Sheet does not exist: {sheet_name}")
+            self.logger.error("Sheet does not exist: %s", sheet_name)
             raise ValueError(f"Sheet does not exist: {sheet_name}")
         
         # Get the calculated value from the data_only workbook
         sheet = self.workbook[sheet_name]
-        value = sheet.cell(row=row, column=col).value
+        value = self._cell_value(sheet, row, col)
         
         # Check if cell is formatted as currency
-        formula_cell = self.formula_workbook[sheet_name].cell(row=row, column=col)
-        is_currency = formula_cell.number_format and '$' in formula_cell.number_format
+        is_currency = self._is_currency(sheet_name, row, col)
         
         # Format the value
         formatted_value = self._format_numeric_value(value, is_currency)
+        self._record("cells_read")
 
-        # Get the formula (if any) from the formula workbook for logging
-        formula = formula_cell.value
-        
-        cell_ref = f"{get_column_letter(col)}{row}"
-        if isinstance(formula, str) and formula.startswith('='):
-            self.logger.info(f"Read calculated value '{formatted_value}' from cell {cell_ref} in sheet {sheet_name} (formula: {formula})")
-        else:
-            self.logger.info(f"Read value '{formatted_value}' from cell {cell_ref} in sheet {sheet_name}")
+        # Per-cell detail is DEBUG only; skip building it unless someone is listening
+        if self.logger.isEnabledFor(logging.DEBUG):
+            # Get the formula (if any) from the formula workbook for logging
+            formula = self._cell_value(self.formula_workbook[sheet_name], row, col)
+            
+            cell_ref = f"{get_column_letter(col)}{row}"
+            if isinstance(formula, str) and formula.startswith('='):
+                self.logger.debug("Read calculated value '%s' from cell %s in sheet %s (formula: %s)", formatted_value, cell_ref, sheet_name, formula)
+            else:
+                self.logger.debug("Read value '%s' from cell %s in sheet %s", formatted_value, cell_ref, sheet_name)
         
         return formatted_value
     
+    @_writes
     def write_cell(self, sheet_name, row_or_cell, column=None, value=None):
         """
         Write a value to a cell.
@@ -301,6 +2162,7 @@ class excelManager:
         if not self.formula_workbook:
             self.logger.error("No workbook loaded")
             raise ValueError("No workbook loaded")
+        self._check_writable()
         
         # Get the row and column based on the input parameters
         if column is None and value is None:
@@ -321,16 +2183,22 @@ class excelManager:
             col = column
         
         if sheet_name not in self.formula_workbook.sheetnames:
-            self.logger.error(f"Sheet does not exist: {sheet_name}")
+            self.logger.error("Sheet does not exist: %s", sheet_name)
             raise ValueError(f"Sheet does not exist: {sheet_name}")
         
         # Write to the formula workbook
         formula_sheet = self.formula_workbook[sheet_name]
         formula_sheet.cell(row=row, column=col).value = value
-        
-        cell_ref = f"{get_column_letter(col)}{row}"
-        self.logger.info(f"Wrote value '{value}' to cell {cell_ref} in sheet {sheet_name}")
+        self._mark_dirty(sheet_name, row, col)
+        self._index_write(sheet_name, row, col, value)
+        self._revision += 1
+        self._record("cells_written")
+        
+        if self.logger.isEnabledFor(logging.DEBUG):
+            cell_ref = f"{get_column_letter(col)}{row}"
+            self.logger.debug("Wrote value '%s' to cell %s in sheet %s", value, cell_ref, sheet_name)
     
+    @_reads
     def read_range(self, sheet_name, start_cell_or_row, start_column=None, end_cell_or_row=None, end_column=None):
         """
         Read a range of cells.
@@ -347,11 +2215,9 @@ class excelManager:
             raise ValueError("No workbook loaded")
         
         # Parse the arguments to determine start and end coordinates
-        if isinstance(start_cell_or_row, str) and ':' in start_cell_or_row and start_column is None:
-            # Range notation like 'A1:C3'
-            start_ref, end_ref = start_cell_or_row.split(':')
-            sheet_ref, start_row, start_col = self._parse_cell_reference(start_ref, sheet_name)
-            _, end_row, end_col = self._parse_cell_reference(end_ref, sheet_name)
+        if isinstance(start_cell_or_row, str) and start_column is None:
+            # Range notation like 'A1:C3', 'A:C', 'Sheet2!A1:C3' or a defined name
+            sheet_ref, start_row, start_col, end_row, end_col = self._resolve_reference(start_cell_or_row, sheet_name)
             sheet_name = sheet_ref  # Use the sheet name from the reference if provided
         elif isinstance(start_cell_or_row, str) and isinstance(start_column, str) and end_cell_or_row is None:
             # Two cell references like 'A1', 'C3'
@@ -369,30 +2235,111 @@ class excelManager:
             raise ValueError("Invalid arguments for read_range")
         
         if sheet_name not in self.workbook.sheetnames:
-            self.logger.error(f"Sheet does not exist: {sheet_name}")
+            self.logger.error("Sheet does not exist: %s", sheet_name)
             raise ValueError(f"Sheet does not exist: {sheet_name}")
         
+        values = self._read_block(sheet_name, start_row, start_col, end_row, end_col)
+        
+        range_ref = f"{get_column_letter(start_col)}{start_row}:{get_column_letter(end_col)}{end_row}"
+        self.logger.info("Read range %s in sheet %s", range_ref, sheet_name)
+        return values
+    
+    def _read_block(self, sheet_name, start_row, start_col, end_row, end_col):
+        """
+        Return the formatted values of a rectangular block, row by row.
+        """
         # Get the calculated values from the data_only workbook
         sheet = self.workbook[sheet_name]
         values = []
         for row in range(start_row, end_row + 1):
             row_values = []
             for col in range(start_col, end_col + 1):
-                cell_val = sheet.cell(row=row, column=col).value
+                cell_val = self._cell_value(sheet, row, col)
                 
                 # Check if cell is formatted as currency
-                formula_cell = self.formula_workbook[sheet_name].cell(row=row, column=col)
-                is_currency = formula_cell.number_format and '$' in formula_cell.number_format
+                is_currency = self._is_currency(sheet_name, row, col)
                 
                 # Format the value
                 formatted_val = self._format_numeric_value(cell_val, is_currency)
                 row_values.append(formatted_val)
             values.append(row_values)
+        self._record("cells_read", max(end_row - start_row + 1, 0) * max(end_col - start_col + 1, 0))
+        return values
+    
+    @_reads
+    def get_sheet_extent(self, sheet_name):
+        """
+        Return (rows, columns) spanned by the non-empty cells of a sheet.
         
-        range_ref = f"{get_column_letter(start_col)}{start_row}:{get_column_letter(end_col)}{end_row}"
-        self.logger.info(f"Read range {range_ref} in sheet {sheet_name}")
+        Unlike the sheet's own dimensions, cells that only carry formatting do
+        not count. Cached until the workbook is reloaded, so cheap to call
+        on every page of a preview.
+        """
+        if not self.workbook:
+            self.logger.error("No workbook loaded")
+            raise ValueError("No workbook loaded")
+        
+        if sheet_name not in self.workbook.sheetnames:
+            self.logger.error("Sheet does not exist: %s", sheet_name)
+            raise ValueError(f"Sheet does not exist: {sheet_name}")
+        
+        max_row, max_col, _ = self._data_extent(sheet_name)
+        return max_row, max_col
+    
+    @_reads
+    def read_window(self, sheet_name, start_row, row_count, start_col=1, end_col=None):
+        """
+        Read up to row_count rows starting at start_row, formatted like read_range.
+        
+        Columns run from start_col to end_col (default: the last column with
+        data). The window is clipped to the sheet's extent, so a window past
+        the last row returns fewer rows, or none. Only the cells in the
+        window are touched, however large the sheet.
+        """
+        if not self.workbook:
+            self.logger.error("No workbook loaded")
+            raise ValueError("No workbook loaded")
+        
+        if sheet_name not in self.workbook.sheetnames:
+            self.logger.error("Sheet does not exist: %s", sheet_name)
+            raise ValueError(f"Sheet does not exist: {sheet_name}")
+        
+        if start_row < 1 or row_count < 0:
+            self.logger.error("Invalid window: start_row=%s, row_count=%s", start_row, row_count)
+            raise ValueError(f"Invalid window: start_row={start_row}, row_count={row_count}")
+        
+        max_row, max_col, _ = self._data_extent(sheet_name)
+        end_row = min(start_row + row_count - 1, max_row)
+        end_col = max_col if end_col is None else end_col
+        values = self._read_block(sheet_name, start_row, start_col, end_row, end_col)
+        
+        self.logger.debug("Read window of %s rows from row %s in sheet %s", len(values), start_row, sheet_name)
         return values
     
+    @_reads
+    def get_range_bounds(self, sheet_name, range_reference):
+        """
+        Resolve a range reference to (sheet name, start_row, start_col, end_row, end_col)
+        without reading any cells.
+        
+        Accepts every reference read_range does ('A1:C3', 'A:C', 'Sheet2!A1:C3',
+        defined names); open ends are bounded by the sheet's data. Together
+        with read_window this pages through a large range instead of reading
+        it whole.
+        """
+        if not self.workbook:
+            self.logger.error("No workbook loaded")
+            raise ValueError("No workbook loaded")
+        
+        bounds = self._resolve_reference(range_reference, sheet_name)
+        if bounds[0] not in self.workbook.sheetnames:
+            self.logger.error("Sheet does not exist: %s", bounds[0])
+            raise ValueError(f"Sheet does not exist: {bounds[0]}")
+        
+        self.logger.debug("Resolved range %s to %s", range_reference, bounds)
+        return bounds
+    
+    @_writes
     def write_range(self, sheet_name, start_cell_or_row, start_column_or_values=None, values_or_end_row=None, end_column=None):
         """
         Write values to a range of cells.
@@ -404,6 +2351,7 @@ class excelManager:
         if not self.formula_workbook:
             self.logger.error("No workbook loaded")
             raise ValueError("No workbook loaded")
+        self._check_writable()
         
         # Parse the arguments to determine the start coordinate and values
         if isinstance(start_cell_or_row, str) and values_or_end_row is None:
@@ -421,7 +2369,7 @@ class excelManager:
             raise ValueError("Invalid arguments for write_range")
         
         if sheet_name not in self.formula_workbook.sheetnames:
-            self.logger.error(f"Sheet does not exist: {sheet_name}")
+            self.logger.error("Sheet does not exist: %s", sheet_name)
             raise ValueError(f"Sheet does not exist: {sheet_name}")
         
         # Write to the formula workbook
@@ -429,13 +2377,110 @@ class excelManager:
         for i, row_values in enumerate(values):
             for j, value in enumerate(row_values):
                 formula_sheet.cell(row=start_row + i, column=start_col + j).value = value
+                self._mark_dirty(sheet_name, start_row + i, start_col + j)
+                self._index_write(sheet_name, start_row + i, start_col + j, value)
+        self._revision += 1
+        self._record("cells_written", sum(len(row_values) for row_values in values))
         
         end_row = start_row + len(values) - 1
         end_col = start_col + len(values[0]) - 1 if values else start_col
         range_ref = f"{get_column_letter(start_col)}{start_row}:{get_column_letter(end_col)}{end_row}"
         
-        self.logger.info(f"Wrote values to range {range_ref} in sheet {sheet_name}")
+        self.logger.info("Wrote values to range %s in sheet %s", range_ref, sheet_name)
+    
+    @_writes
+    def import_table(self, sheet_name, source, start_cell="A1", header=True, number_formats=None, chunk_size=10000):
+        """
+        Write a table into a sheet in bulk, with its top-left corner at start_cell.
+        
+        Parameters:
+        - source: a pandas DataFrame, a path to a .csv or .parquet file, or a
+          file-like object holding CSV text. CSV fields that are plainly
+          numbers are written as numbers.
+        - header: write the column names as the first row (for CSV sources,
+          whether the first line holds them)
+        - number_formats: a number format for every column, or a dict of
+          column name (or 0-based position) -> number format. Besides Excel
+          format codes, "currency", "number", "integer", "percent" and "date"
+          are accepted; "currency" makes read_* format values with a $.
+          Cells already in the range keep their formatting unless a number
+          format is given for their column.
+        - chunk_size: rows read at a time from Parquet files
+        
+        Returns the number of data rows written.
+        """
+        if not self.formula_workbook:
+            self.logger.error("No workbook loaded")
+            raise ValueError("No workbook loaded")
+        self._check_writable()
+        
+        sheet_ref, start_row, start_col = self._parse_cell_reference(start_cell, sheet_name)
+        sheet_name = sheet_ref  # Use the sheet name from the reference if provided
+        if sheet_name not in self.formula_workbook.sheetnames:
+            self.logger.error("Sheet does not exist: %s", sheet_name)
+            raise ValueError(f"Sheet does not exist: {sheet_name}")
+        
+        names, rows = _table_source(source, header, chunk_size)
+        formula_sheet = self.formula_workbook[sheet_name]
         
+        from openpyxl.cell.cell import Cell
+        from openpyxl.styles.cell_style import StyleArray
+        
+        def number_style(number_format):
+            return _number_format_style(self.formula_workbook, _NUMBER_FORMATS.get(number_format, number_format))
+        
+        # Resolve the number formats to one style array per column position
+        styles, default_style = {}, None
+        if isinstance(number_formats, dict):
+            for key, number_format in number_formats.items():
+                position = key if isinstance(key, int) else (names.index(key) if names and key in names else None)
+                if position is None:
+                    self.logger.error("Column not found: %s", key)
+                    raise ValueError(f"Column not found: {key}")
+                styles[position] = number_style(number_format)
+        elif number_formats is not None:
+            default_style = number_style(number_formats)
+        
+        # Cells are created and placed directly instead of going through
+        # sheet.cell(), which looks up (and validates) every coordinate
+        cells = formula_sheet._cells
+        
+        def place(row, col, value, style):
+            # Like write_range, an existing cell keeps its formatting unless a number format replaces it
+            existing = cells.get((row, col))
+            if existing is not None:
+                existing.value = value
+                if style is not None:
+                    existing._style = StyleArray(style)
+            elif value is not None or style is not None:
+                cells[(row, col)] = Cell(formula_sheet, row=row, column=col, value=value, style_array=style)
+        
+        row = start_row
+        if header and names:
+            for position, name in enumerate(names):
+                place(row, start_col + position, name, None)
+            row += 1
+        data_start = row
+        width = len(names) if names else 0
+        for values in rows:
+            for position, value in enumerate(values):
+                place(row, start_col + position, value, styles.get(position, default_style))
+            width = max(width, len(values))
+            row += 1
+        row_count = row - data_start
+        
+        # A block this size is cheaper to save in full than to patch cell by
+        # cell, and any new number formats change the styles part anyway
+        self._structure_dirty = True
+        self._search_index = None
+        self._revision += 1
+        self._record("cells_written", (row - start_row) * width)
+        
+        end_ref = f"{get_column_letter(start_col + max(width, 1) - 1)}{max(row - 1, start_row)}"
+        self.logger.info("Imported %s rows into range %s%s:%s in sheet %s", row_count, get_column_letter(start_col), start_row, end_ref, sheet_name)
+        return row_count
+        
+    @_reads
     def read_total(self, sheet_name, row_or_cell, column=None):
         """
         Read the total value by traversing down rows until an empty cell is found.
@@ -466,36 +2511,36 @@ class excelManager:
             start_col = column
         
         if sheet_name not in self.workbook.sheetnames:
-            self.logger.error(f"Sheet does not exist: {sheet_name}")
+            self.logger.error("Sheet does not exist: %s", sheet_name)
             raise ValueError(f"Sheet does not exist: {sheet_name}")
         
         # Get the sheet from the data_only workbook to read calculated values
         sheet = self.workbook[sheet_name]
         
-        # Start from the given cell and traverse down
+        # Start from the given cell and traverse down, stopping at the column's last value
         current_row = start_row
-        max_rows = sheet.max_row
+        max_rows = self._data_extent(sheet_name)[2].get(start_col, 0)
         
         # Keep track of the last non-empty cell value encountered
         last_value = None
         last_row = None
         
         while current_row <= max_rows:
-            value = sheet.cell(row=current_row, column=start_col).value
+            value = self._cell_value(sheet, current_row, start_col)
             
             # If we find an empty cell and we've seen at least one non-empty cell, 
             # we'll return the last non-empty cell value (which should be the total)
             if value is None or value == '':
                 if last_value is not None:
                     # Check if cell is formatted as currency
-                    formula_cell = self.formula_workbook[sheet_name].cell(row=last_row, column=start_col)
-                    is_currency = formula_cell.number_format and '$' in formula_cell.number_format
+                    is_currency = self._is_currency(sheet_name, last_row, start_col)
                     
                     # Format the value
                     formatted_value = self._format_numeric_value(last_value, is_currency)
+                    self._record("cells_read", current_row - start_row + 1)
                     
                     cell_ref = f"{get_column_letter(start_col)}{last_row}"
-                    self.logger.info(f"Found total value '{formatted_value}' at cell {cell_ref} in sheet {sheet_name}")
+                    self.logger.info("Found total value '%s' at cell %s in sheet %s", formatted_value, cell_ref, sheet_name)
                     return formatted_value
                 else:
                     # If we haven't found any non-empty cells, continue searching
@@ -510,20 +2555,22 @@ class excelManager:
         # If we reach the end of the sheet and have a value, return it
         if last_value is not None:
             # Check if cell is formatted as currency
-            formula_cell = self.formula_workbook[sheet_name].cell(row=last_row, column=start_col)
-            is_currency = formula_cell.number_format and '$' in formula_cell.number_format
+            is_currency = self._is_currency(sheet_name, last_row, start_col)
             
             # Format the value
             formatted_value = self._format_numeric_value(last_value, is_currency)
+            self._record("cells_read", current_row - start_row)
             
             cell_ref = f"{get_column_letter(start_col)}{last_row}"
-            self.logger.info(f"Found total value '{formatted_value}' at cell {cell_ref} in sheet {sheet_name} (at end of sheet)")
+            self.logger.info("Found total value '%s' at cell %s in sheet %s (at end of sheet)", formatted_value, cell_ref, sheet_name)
             return formatted_value
         
         # If no non-empty cells were found
-        self.logger.warning(f"No values found starting from {get_column_letter(start_col)}{start_row} in sheet {sheet_name}")
+        self._record("cells_read", current_row - start_row)
+        self.logger.warning("No values found starting from %s%s in sheet %s", get_column_letter(start_col), start_row, sheet_name)
         return None
     
+    @_reads
     def read_items(self, sheet_name, row_or_cell, column=None, offset=0):
         """
         Read a range of items until an empty cell is found.
@@ -561,35 +2608,35 @@ class excelManager:
             start_col = column
         
         if sheet_name not in self.workbook.sheetnames:
-            self.logger.error(f"Sheet does not exist: {sheet_name}")
+            self.logger.error("Sheet does not exist: %s", sheet_name)
             raise ValueError(f"Sheet does not exist: {sheet_name}")
         
         # Get the sheet from the data_only workbook to read calculated values
         sheet = self.workbook[sheet_name]
         
-        # Start from the given cell and traverse down
+        # Start from the given cell and traverse down, stopping at the column's last value
         current_row = start_row
-        max_rows = sheet.max_row
+        max_rows = self._data_extent(sheet_name)[2].get(start_col, 0)
         
         # Store all non-empty values encountered
         items = []
         
         while current_row <= max_rows:
-            value = sheet.cell(row=current_row, column=start_col).value
+            value = self._cell_value(sheet, current_row, start_col)
             
             # If we find an empty cell, break the loop
             if value is None or value == '':
                 break
             
             # Check if cell is formatted as currency
-            formula_cell = self.formula_workbook[sheet_name].cell(row=current_row, column=start_col)
-            is_currency = formula_cell.number_format and '$' in formula_cell.number_format
+            is_currency = self._is_currency(sheet_name, current_row, start_col)
             
             # Format the value
             formatted_value = self._format_numeric_value(value, is_currency)
             
             items.append(formatted_value)
             current_row += 1
+        self._record("cells_read", current_row - start_row)
         
         # Apply the offset to exclude the specified number of rows from the end
         if offset != 0 and items:
@@ -601,10 +2648,11 @@ class excelManager:
         end_cell_ref = f"{get_column_letter(start_col)}{end_row}"
         range_ref = f"{start_cell_ref}:{end_cell_ref}" if items else start_cell_ref
         
-        self.logger.info(f"Read {len(items)} items from range {range_ref} in sheet {sheet_name} with offset {offset}")
+        self.logger.info("Read %s items from range %s in sheet %s with offset %s", len(items), range_ref, sheet_name, offset)
         
         return items
     
+    @_reads
     def read_title_total(self, sheet_name, row_or_cell, title, column=None):
         """
         Find a column with a matching case-insensitive title, then get the total value from that column.
@@ -642,19 +2690,19 @@ class excelManager:
             title = title  # In this case, title is the last parameter
         
         if sheet_name not in self.workbook.sheetnames:
-            self.logger.error(f"Sheet does not exist: {sheet_name}")
+            self.logger.error("Sheet does not exist: %s", sheet_name)
             raise ValueError(f"Sheet does not exist: {sheet_name}")
         
         # Get the sheet from the data_only workbook to read calculated values
         sheet = self.workbook[sheet_name]
         
         # Determine the maximum column to search
-        max_col = sheet.max_column
+        max_col = self._data_extent(sheet_name)[1]
         
         # Start from the given cell and traverse right to find the title
         title_col = None
         for col in range(start_col, max_col + 1):
-            cell_value = sheet.cell(row=start_row, column=col).value
+            cell_value = self._cell_value(sheet, start_row, col)
             
             # Check if the cell value matches the title (case-insensitive)
             if cell_value and isinstance(cell_value, str) and cell_value.lower() == title.lower():
@@ -662,39 +2710,51 @@ class excelManager:
                 break
         
         if title_col is None:
-            self.logger.warning(f"Title '{title}' not found in row {start_row} starting from column {start_col} in sheet {sheet_name}")
+            self.logger.warning("Title '%s' not found in row %s starting from column %s in sheet %s", title, start_row, start_col, sheet_name)
             return None
         
-        # Once the title column is found, use read_total to get the total value
-        title_cell_ref = f"{get_column_letter(title_col)}{start_row + 1}"  # Start from the cell below the title
+        self.logger.info("Found title '%s' at column %s in sheet %s", title, get_column_letter(title_col), sheet_name)
         
-        self.logger.info(f"Found title '{title}' at column {get_column_letter(title_col)} in sheet {sheet_name}")
-        
-        # Now find the total in this column
-        return self.read_total(sheet_name, title_cell_ref)
+        # Now find the total in this column, starting from the cell below the title
+        return self.read_total(sheet_name, start_row + 1, title_col)
     
-    def read_columns(self, sheet_name, input_cells, use_titles=False, start_row=None):
+    def _find_title_column(self, sheet_name, title_row, title):
         """
-        Read multiple columns from a sheet and append them side by side.
-        
-        Parameters:
-        - sheet_name: The name of the sheet to read from
-        - input_cells: Either a comma-separated string of cell references or column titles,
-                      or a list of cell references or column titles
-        - use_titles: If True, treat input_cells as column titles to search for.
-                     If False, treat input_cells as cell references.
-        - start_row: Row number to start searching for titles (only used if use_titles is True)
-                    If not provided and use_titles is True, defaults to 1
-        
-        Returns:
-        - A 2D list with the requested columns appended side by side
+        Return the first column whose cell in title_row matches title
+        (case-insensitive), or None.
+        """
+        sheet = self.workbook[sheet_name]
+        max_col = self._data_extent(sheet_name)[1]
+        for col in range(1, max_col + 1):
+            cell_value = self._cell_value(sheet, title_row, col)
+            if cell_value and isinstance(cell_value, str) and cell_value.lower() == title.lower():
+                return col
+        return None
+    
+    def _item_count(self, sheet_name, start_row, col):
+        """
+        Count the cells read_items would read from start_row down, without formatting them.
+        """
+        sheet = self.workbook[sheet_name]
+        max_rows = self._data_extent(sheet_name)[2].get(col, 0)
+        row = start_row
+        while row <= max_rows:
+            value = self._cell_value(sheet, row, col)
+            if value is None or value == '':
+                break
+            row += 1
+        return row - start_row
+    
+    def _column_spans(self, sheet_name, input_cells, use_titles=False, start_row=None):
+        """
+        Locate the columns requested from read_columns as (header, column, first_row, row_count).
         """
         if not self.workbook:
             self.logger.error("No workbook loaded")
             raise ValueError("No workbook loaded")
         
         if sheet_name not in self.workbook.sheetnames:
-            self.logger.error(f"Sheet does not exist: {sheet_name}")
+            self.logger.error("Sheet does not exist: %s", sheet_name)
             raise ValueError(f"Sheet does not exist: {sheet_name}")
         
         # Get the sheet from the data_only workbook to read calculated values
@@ -709,57 +2769,62 @@ class excelManager:
             self.logger.error("input_cells must be a comma-separated string or a list")
             raise ValueError("input_cells must be a comma-separated string or a list")
         
-        # List to store column data
-        columns_data = []
-        column_headers = []
-        
-        # Process each cell or title
+        spans = []
         for cell_or_title in cells_list:
             if use_titles:
-                # Find column by title
-                if start_row is None:
-                    title_row = 1  # Default to the first row if not specified
-                else:
-                    title_row = start_row
-                
-                # Find the column with the matching title
-                max_col = sheet.max_column
-                title_col = None
-                
-                for col in range(1, max_col + 1):
-                    cell_value = sheet.cell(row=title_row, column=col).value
-                    
-                    # Check if the cell value matches the title (case-insensitive)
-                    if cell_value and isinstance(cell_value, str) and cell_value.lower() == cell_or_title.lower():
-                        title_col = col
-                        break
+                # Find column by title, in the first row unless told otherwise
+                title_row = 1 if start_row is None else start_row
+                title_col = self._find_title_column(sheet_name, title_row, cell_or_title)
                 
                 if title_col is None:
-                    self.logger.warning(f"Title '{cell_or_title}' not found in row {title_row} in sheet {sheet_name}")
+                    self.logger.warning("Title '%s' not found in row %s in sheet %s", cell_or_title, title_row, sheet_name)
                     continue
                 
-                column_headers.append(cell_or_title)
-                # Start reading from the row below the title
-                start_cell_ref = f"{get_column_letter(title_col)}{title_row + 1}"
-                
-                # Read items from this column
-                items = self.read_items(sheet_name, start_cell_ref)
-                columns_data.append(items)
-                
+                # Items run from the row below the title
+                spans.append((cell_or_title, title_col, title_row + 1, self._item_count(sheet_name, title_row + 1, title_col)))
             else:
-                # Process as cell reference
+                # Process as cell reference; the cell itself holds the column header
                 sheet_ref, row, col = self._parse_cell_reference(cell_or_title, sheet_name)
-                
-                # Get the column header value (from the specified cell)
-                header_value = sheet.cell(row=row, column=col).value
-                column_headers.append(header_value)
-                
-                # Read items from this column, starting from the cell below
-                start_cell_ref = f"{get_column_letter(col)}{row + 1}"
-                
-                # Read items from this column
-                items = self.read_items(sheet_name, start_cell_ref)
-                columns_data.append(items)
+                header_value = self._cell_value(sheet, row, col)
+                spans.append((header_value, col, row + 1, self._item_count(sheet_name, row + 1, col)))
+        return spans
+    
+    @_reads
+    def get_column_spans(self, sheet_name, input_cells, use_titles=False, start_row=None):
+        """
+        Locate the columns read_columns would read, without reading their values.
+        
+        Takes the same arguments as read_columns and returns one
+        (header, column, first_row, row_count) tuple per column found, so a
+        large result can be paged with read_window(sheet_name, first_row +
+        offset, count, column, column).
+        """
+        spans = self._column_spans(sheet_name, input_cells, use_titles, start_row)
+        self.logger.debug("Located %s columns in sheet %s", len(spans), sheet_name)
+        return spans
+    
+    @_reads
+    def read_columns(self, sheet_name, input_cells, use_titles=False, start_row=None):
+        """
+        Read multiple columns from a sheet and append them side by side.
+        
+        Parameters:
+        - sheet_name: The name of the sheet to read from
+        - input_cells: Either a comma-separated string of cell references or column titles,
+                      or a list of cell references or column titles
+        - use_titles: If True, treat input_cells as column titles to search for.
+                     If False, treat input_cells as cell references.
+        - start_row: Row number to start searching for titles (only used if use_titles is True)
+                    If not provided and use_titles is True, defaults to 1
+        
+        Returns:
+        - A 2D list with the requested columns appended side by side
+        """
+        spans = self._column_spans(sheet_name, input_cells, use_titles, start_row)
+        column_headers = [header for header, _, _, _ in spans]
+        # Each column is read down to its first empty cell, like read_items
+        columns_data = [[row[0] for row in self._read_block(sheet_name, first_row, col, first_row + row_count - 1, col)]
+                        for _, col, first_row, row_count in spans]
         
         # Determine the maximum length of all columns
         max_length = max([len(col) for col in columns_data]) if columns_data else 0
@@ -780,10 +2845,508 @@ class excelManager:
                 row_data.append(col[i] if i < len(col) else '')
             result.append(row_data)
         
-        if use_titles:
-            log_message = f"Read {len(columns_data)} columns by titles: {', '.join(cells_list)} in sheet {sheet_name}"
+        self.logger.info("Read %s columns %s: %s in sheet %s", len(columns_data),
+                         "by titles" if use_titles else "from cells", input_cells, sheet_name)
+        return result
+    
+    def _get_search_index(self):
+        """
+        Return the search index, building it from the loaded workbooks on first use.
+        
+        Called under the read lock, so concurrent readers share one build.
+        """
+        index = self._search_index
+        if index is not None:
+            return index
+        with self._search_index_lock:
+            if self._search_index is None:
+                start = time.perf_counter()
+                index = _SearchIndex()
+                with _gc_paused():
+                    for formula_sheet in self.formula_workbook.worksheets:
+                        # Literals come from the formula workbook, which already holds
+                        # unsaved writes; formulas are indexed by their calculated value
+                        sheet_name = formula_sheet.title
+                        value_cells = self.workbook[sheet_name]._cells if sheet_name in self.workbook.sheetnames else {}
+                        for key, cell in formula_sheet._cells.items():
+                            value = cell.value
+                            if isinstance(value, str) and value.startswith('='):
+                                value_cell = value_cells.get(key)
+                                value = value_cell.value if value_cell is not None else None
+                            if value is not None:
+                                index.add((sheet_name,) + key, value)
+                self._search_index = index
+                self.logger.info("Built search index of %s cells in %.3fs", len(index.cells), time.perf_counter() - start)
+            return self._search_index
+    
+    def _search_results(self, keys, sheet_name):
+        """
+        Sort index keys into workbook order as (sheet name, cell reference) pairs.
+        """
+        if sheet_name is not None:
+            if sheet_name not in self.formula_workbook.sheetnames:
+                self.logger.error("Sheet does not exist: %s", sheet_name)
+                raise ValueError(f"Sheet does not exist: {sheet_name}")
+            keys = [key for key in keys if key[0] == sheet_name]
+        order = {name: position for position, name in enumerate(self.formula_workbook.sheetnames)}
+        keys = sorted(keys, key=lambda key: (order.get(key[0], len(order)), key[1], key[2]))
+        return [(name, f"{get_column_letter(col)}{row}") for name, row, col in keys]
+    
+    @_reads
+    def find(self, value, sheet_name=None):
+        """
+        Find every cell whose value equals value.
+        
+        Numbers match numerically (12500 finds 12500.0) and text matches the
+        whole cell, ignoring case and surrounding whitespace. Formula cells
+        match on their calculated value. Returns a list of
+        (sheet name, cell reference) pairs in workbook order, optionally
+        limited to one sheet.
+        """
+        if not self.formula_workbook:
+            self.logger.error("No workbook loaded")
+            raise ValueError("No workbook loaded")
+        
+        results = self._search_results(self._get_search_index().find(value), sheet_name)
+        self.logger.debug("Found %s cells equal to '%s'", len(results), value)
+        return results
+    
+    @_reads
+    def search(self, text, sheet_name=None, partial=False):
+        """
+        Find every cell containing all the words of text, ignoring case.
+        
+        search("contingency") finds "Contingency Reserve" and "Total contingency".
+        With partial=True words may also match inside longer words.
+        Returns (sheet name, cell reference) pairs like find.
+        """
+        if not self.formula_workbook:
+            self.logger.error("No workbook loaded")
+            raise ValueError("No workbook loaded")
+        
+        results = self._search_results(self._get_search_index().search(text, partial), sheet_name)
+        self.logger.debug("Found %s cells containing '%s'", len(results), text)
+        return results
+    
+    @_reads
+    def diff(self, other=None):
+        """
+        Report what changed between another version of the workbook and this one.
+        
+        other can be a file path, another excelManager, or None to compare
+        against the file this workbook was last loaded from or saved to.
+        Returns a dict with:
+        - sheets_added / sheets_removed: sheet names present on one side only
+        - changes: sheet name -> list of {"cell", "type", "old", "new"}, where
+          type is "value", "formula" or "format" (format changes also list the
+          changed "attributes" and give the number formats as old/new)
+        - rows_compared / rows_unchanged: how many rows were compared, and how
+          many of them have no entry in changes
+        
+        Values of formula cells are the ones calculated when each version was
+        last saved by Excel; formulas without a calculated value (unsaved edits,
+        files written by openpyxl) only report content changes.
+        """
+        if not self.formula_workbook:
+            self.logger.error("No workbook loaded")
+            raise ValueError("No workbook loaded")
+        
+        new_pair = (self.formula_workbook, self.workbook)
+        if isinstance(other, excelManager):
+            with other._lock.read():
+                if not other.formula_workbook:
+                    self.logger.error("No workbook loaded to compare with")
+                    raise ValueError("No workbook loaded to compare with")
+                result = _diff_workbooks((other.formula_workbook, other.workbook), new_pair)
+            source = other.file_path
+        else:
+            source = other or self._source_path or self.file_path
+            if not source or not os.path.exists(source):
+                self.logger.error("File does not exist: %s", source)
+                raise FileNotFoundError(f"File does not exist: {source}")
+            old_pair = (self._load(source, data_only=False), self._load(source, data_only=True))
+            result = _diff_workbooks(old_pair, new_pair)
+        
+        change_count = sum(len(changes) for changes in result["changes"].values())
+        self.logger.info("Compared with %s: %s changes in %s sheets, %s of %s rows unchanged", source, change_count,
+                         len(result["changes"]), result["rows_unchanged"], result["rows_compared"])
+        return result
+    
+    def _detect_header_row(self, sheet_name, max_rows=50):
+        """
+        Return the first row (within max_rows of the top) holding at least two
+        values that are all text, or None.
+        """
+        sheet = self.workbook[sheet_name]
+        max_row, max_col, _ = self._data_extent(sheet_name)
+        for row in range(1, min(max_row, max_rows) + 1):
+            values = [value for value in (self._cell_value(sheet, row, col) for col in range(1, max_col + 1))
+                      if value is not None and value != '']
+            if len(values) >= 2 and all(isinstance(value, str) for value in values):
+                return row
+        return None
+    
+    @_reads
+    def export_sheet(self, sheet_name, path, format=None, header_row=None, titles=None, chunk_size=10000):
+        """
+        Stream the calculated values of a sheet to a CSV, Parquet or Arrow IPC file.
+        
+        Parameters:
+        - format: "csv", "parquet" or "arrow"; taken from the extension of path
+          (.csv, .parquet, .arrow/.feather/.ipc) when omitted
+        - header_row: row holding the column names, with the data starting below
+          it; "auto" picks the first row of all-text values. Without a header
+          row the columns are named by letter and the data starts at row 1.
+        - titles: only export the columns with these titles in header_row
+          (a list or comma-separated string, matched like read_columns)
+        - chunk_size: rows converted and written at a time
+        
+        Values are written raw (numbers stay numbers, not formatted strings).
+        Each column gets one type: integer, float, boolean, datetime, date, or
+        text when its values are mixed. Parquet and Arrow need pyarrow.
+        Returns the number of data rows written.
+        """
+        if not self.workbook:
+            self.logger.error("No workbook loaded")
+            raise ValueError("No workbook loaded")
+        
+        if sheet_name not in self.workbook.sheetnames:
+            self.logger.error("Sheet does not exist: %s", sheet_name)
+            raise ValueError(f"Sheet does not exist: {sheet_name}")
+        
+        format = format or _EXPORT_FORMATS.get(os.path.splitext(path)[1].lower())
+        if format not in _EXPORT_EXTENSIONS:
+            self.logger.error("Unsupported export format: %s", format or path)
+            raise ValueError(f"Unsupported export format: {format or path}")
+        
+        sheet = self.workbook[sheet_name]
+        max_row, max_col, _ = self._data_extent(sheet_name)
+        if header_row == "auto":
+            header_row = self._detect_header_row(sheet_name)
+        
+        # Pick the columns and name them
+        if titles is not None:
+            if header_row is None:
+                self.logger.error("titles need a header_row")
+                raise ValueError("titles need a header_row")
+            if isinstance(titles, str):
+                titles = [title.strip() for title in titles.split(',')]
+            columns = []
+            for title in titles:
+                col = self._find_title_column(sheet_name, header_row, title)
+                if col is None:
+                    self.logger.error("Title '%s' not found in row %s in sheet %s", title, header_row, sheet_name)
+                    raise ValueError(f"Title not found: {title}")
+                columns.append(col)
+        else:
+            columns = list(range(1, max_col + 1))
+        names = []
+        for col in columns:
+            name = self._cell_value(sheet, header_row, col) if header_row else None
+            name = str(name).strip() if name not in (None, '') else get_column_letter(col)
+            unique_name, suffix = name, 2
+            while unique_name in names:
+                unique_name, suffix = f"{name}_{suffix}", suffix + 1
+            names.append(unique_name)
+        first_row = header_row + 1 if header_row else 1
+        
+        # One pass over the existing cells to type the columns
+        kinds = {col: set() for col in columns}
+        for (row, col), cell in sheet._cells.items():
+            if row >= first_row and col in kinds and cell.value is not None and cell.value != '':
+                kinds[col].add(_value_kind(cell.value))
+        column_kinds = [_column_kind(kinds[col]) for col in columns]
+        
+        if format == "csv":
+            writer = _CsvExportWriter(path, names, column_kinds)
         else:
-            log_message = f"Read {len(columns_data)} columns from cells: {', '.join(cells_list)} in sheet {sheet_name}"
+            writer = _ArrowExportWriter(path, names, column_kinds, format)
+        
+        cells = sheet._cells
+        row_count = max(max_row - first_row + 1, 0)
+        try:
+            for chunk_start in range(first_row, max_row + 1, chunk_size):
+                chunk_rows = range(chunk_start, min(chunk_start + chunk_size, max_row + 1))
+                chunk = []
+                for col, kind in zip(columns, column_kinds):
+                    column = []
+                    for row in chunk_rows:
+                        cell = cells.get((row, col))
+                        value = cell.value if cell is not None else None
+                        column.append(None if value == '' else _convert_for_kind(value, kind))
+                    chunk.append(column)
+                writer.write(chunk)
+        except Exception:
+            writer.close()
+            os.remove(path)
+            raise
+        writer.close()
+        self._record("cells_read", row_count * len(columns))
+        
+        self.logger.info("Exported %s rows x %s columns of sheet %s to %s (%s)", row_count, len(columns), sheet_name, path, format)
+        return row_count
+    
+    @_reads
+    def export_workbook(self, directory, format="parquet", header_row=None, chunk_size=10000):
+        """
+        Export every sheet with export_sheet to "<directory>/<sheet name>.<ext>".
+        
+        Returns {sheet name: file path}.
+        """
+        if not self.workbook:
+            self.logger.error("No workbook loaded")
+            raise ValueError("No workbook loaded")
+        
+        if format not in _EXPORT_EXTENSIONS:
+            self.logger.error("Unsupported export format: %s", format)
+            raise ValueError(f"Unsupported export format: {format}")
+        
+        os.makedirs(directory, exist_ok=True)
+        paths = {}
+        for sheet_name in self.workbook.sheetnames:
+            file_name = re.sub(r'[\\/:*?"<>|]', '_', sheet_name) + _EXPORT_EXTENSIONS[format]
+            paths[sheet_name] = os.path.join(directory, file_name)
+            self.export_sheet(sheet_name, paths[sheet_name], format, header_row=header_row, chunk_size=chunk_size)
+        
+        self.logger.info("Exported %s sheets to %s", len(paths), directory)
+        return paths
+
+class excelProbe:
+    """
+    Lightweight, read-only metadata access to an .xlsx file.
+    
+    Only the zip parts needed for a query are read, and worksheets are
+    stream-parsed so that header lookups stop after the first rows. No
+    openpyxl Workbook is built, which makes this suitable for triaging
+    large batches of files (sheet names, dimensions, header rows).
+    
+    Values are returned raw: numbers, strings and booleans, without
+    number-format handling or date conversion.
+    """
+    def __init__(self, file_path):
+        self.logger = logger
+        if not os.path.exists(file_path):
+            self.logger.error("File does not exist: %s", file_path)
+            raise FileNotFoundError(f"File does not exist: {file_path}")
+        
+        import zipfile
+        try:
+            self._archive = zipfile.ZipFile(file_path)
+        except zipfile.BadZipFile:
+            self.logger.error("Not an .xlsx file: %s", file_path)
+            raise ValueError(f"Not an .xlsx file: {file_path}")
+        
+        self.file_path = file_path
+        self._sheet_parts = None
+        self._dimensions = {}
+        # Shared strings are parsed incrementally, only as far as the highest index requested
+        self._shared_strings = []
+        self._shared_strings_opened = False
+        self._shared_strings_stream = None
+        self._shared_strings_events = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        """
+        Close the underlying file.
+        """
+        if self._shared_strings_stream is not None:
+            self._shared_strings_stream.close()
+            self._shared_strings_stream = self._shared_strings_events = None
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+    
+    def get_sheet_names(self):
+        """
+        Return the names of the sheets in the workbook.
+        """
+        return list(self._get_sheet_parts())
+    
+    def count_sheets(self):
+        """
+        Return the number of sheets in the workbook.
+        """
+        return len(self._get_sheet_parts())
+    
+    def get_dimensions(self, sheet_name=None):
+        """
+        Return the used range of a sheet (e.g. 'A1:M31'), or a dict of
+        sheet name -> range for every sheet when sheet_name is omitted.
+        
+        The stored <dimension> element is used when present; otherwise the
+        sheet is streamed once to find its extent. Returns None for a sheet
+        with no cells.
+        """
+        if sheet_name is None:
+            return {name: self.get_dimensions(name) for name in self._get_sheet_parts()}
+        
+        part = self._get_sheet_part(sheet_name)
+        if sheet_name in self._dimensions:
+            return self._dimensions[sheet_name]
+        
+        import xml.etree.ElementTree as ET
+        dimension = None
+        min_row = min_col = max_row = max_col = None
+        with self._archive.open(part) as stream:
+            for event, element in ET.iterparse(stream, events=("start", "end")):
+                tag = element.tag.rpartition("}")[2]
+                if event == "start":
+                    if tag == "dimension":
+                        dimension = element.get("ref")
+                        break
+                    continue
+                if tag == "c" and element.get("r"):
+                    row, col = coordinate_to_tuple(element.get("r"))
+                    min_row = row if min_row is None else min(min_row, row)
+                    max_row = row if max_row is None else max(max_row, row)
+                    min_col = col if min_col is None else min(min_col, col)
+                    max_col = col if max_col is None else max(max_col, col)
+                elif tag == "row":
+                    element.clear()
+        
+        if dimension is None and min_row is not None:
+            dimension = f"{get_column_letter(min_col)}{min_row}:{get_column_letter(max_col)}{max_row}"
+        self._dimensions[sheet_name] = dimension
+        self.logger.info("Probed dimensions of sheet %s: %s", sheet_name, dimension)
+        return dimension
+    
+    def get_rows(self, sheet_name, max_rows=1):
+        """
+        Return the first max_rows rows of a sheet as lists of values.
+        
+        Each row starts at column A and runs to its last non-empty cell;
+        missing rows are returned as empty lists. Parsing stops as soon as
+        the requested rows have been read.
+        """
+        import xml.etree.ElementTree as ET
+        part = self._get_sheet_part(sheet_name)
+        rows = [[] for _ in range(max_rows)]
+        
+        with self._archive.open(part) as stream:
+            row_number = 0
+            col_number = 0
+            for event, element in ET.iterparse(stream, events=("start", "end")):
+                tag = element.tag.rpartition("}")[2]
+                if event == "start":
+                    if tag == "row":
+                        row_number = int(element.get("r") or row_number + 1)
+                        col_number = 0
+                        if row_number > max_rows:
+                            break
+                    continue
+                if tag == "c":
+                    ref = element.get("r")
+                    col_number = coordinate_to_tuple(ref)[1] if ref else col_number + 1
+                    value = self._cell_value(element)
+                    if value is not None and row_number <= max_rows:
+                        row_values = rows[row_number - 1]
+                        row_values.extend([None] * (col_number - len(row_values)))
+                        row_values[col_number - 1] = value
+                elif tag == "row":
+                    element.clear()
+        
+        self.logger.info("Probed first %s rows of sheet %s", max_rows, sheet_name)
+        return rows
+    
+    def get_header_row(self, sheet_name, row=1):
+        """
+        Return the values in the given row (the header row by default).
+        """
+        return self.get_rows(sheet_name, max_rows=row)[row - 1]
+    
+    def has_title(self, title, sheet_name=None, row=1):
+        """
+        Check whether a case-insensitive title appears in the given row.
+        
+        When sheet_name is omitted every sheet is checked.
+        """
+        sheet_names = [sheet_name] if sheet_name is not None else self.get_sheet_names()
+        for name in sheet_names:
+            for value in self.get_header_row(name, row):
+                if value and isinstance(value, str) and value.lower() == title.lower():
+                    return True
+        return False
+    
+    def _get_sheet_parts(self):
+        if self._archive is None:
+            self.logger.error("Probe is closed")
+            raise ValueError("Probe is closed")
+        if self._sheet_parts is None:
+            self._sheet_parts = _sheet_part_names(self._archive)
+        return self._sheet_parts
+    
+    def _get_sheet_part(self, sheet_name):
+        parts = self._get_sheet_parts()
+        if sheet_name not in parts:
+            self.logger.error("Sheet does not exist: %s", sheet_name)
+            raise ValueError(f"Sheet does not exist: {sheet_name}")
+        return parts[sheet_name]
+    
+    def _cell_value(self, element):
+        """
+        Decode a <c> element into a Python value.
+        """
+        cell_type = element.get("t", "n")
+        if cell_type == "inlineStr":
+            return "".join(t.text or "" for t in element.iter(f"{{{_NS_MAIN}}}t"))
+        
+        raw = element.find(f"{{{_NS_MAIN}}}v")
+        if raw is None or raw.text is None:
+            return None
+        text = raw.text
+        if cell_type == "s":
+            return self._shared_string(int(text))
+        if cell_type == "b":
+            return text == "1"
+        if cell_type in ("str", "e"):
+            return text
+        try:
+            return int(text)
+        except ValueError:
+            pass
+        try:
+            return float(text)
+        except ValueError:
+            return text
+    
+    def _shared_string(self, index):
+        """
+        Return a shared string, parsing the shared strings part only as far as needed.
+        
+        The part is located through the workbook relationships once; after it
+        has been read to the end, lookups are list indexing only.
+        """
+        if not self._shared_strings_opened:
+            self._shared_strings_opened = True
+            part = _shared_strings_part_name(self._archive)
+            if part is not None:
+                import xml.etree.ElementTree as ET
+                self._shared_strings_stream = self._archive.open(part)
+                self._shared_strings_events = ET.iterparse(self._shared_strings_stream, events=("end",))
+        
+        while index >= len(self._shared_strings) and self._shared_strings_events is not None:
+            for _, element in self._shared_strings_events:
+                if element.tag == f"{{{_NS_MAIN}}}si":
+                    # Plain text or rich-text runs; phonetic runs (rPh) are not displayed
+                    texts = []
+                    for child in element:
+                        if child.tag == f"{{{_NS_MAIN}}}t":
+                            texts.append(child.text or "")
+                        elif child.tag == f"{{{_NS_MAIN}}}r":
+                            run_text = child.find(f"{{{_NS_MAIN}}}t")
+                            texts.append(run_text.text or "" if run_text is not None else "")
+                    self._shared_strings.append("".join(texts))
+                    element.clear()
+                    if index < len(self._shared_strings):
+                        break
+            else:
+                self._shared_strings_stream.close()
+                self._shared_strings_stream = self._shared_strings_events = None
         
-        self.logger.info(log_message)
-        return result
\ No newline at end of file
+        return self._shared_strings[index] if index < len(self._shared_strings) else None
@@ -0,0 +1,353 @@
+"""
+Batch generation of Word reports from cost plan workbooks.
+
+A report is a .docx template with {{PLACEHOLDER}} fields (such as
+assets/SYNOPSIS_SHEET.docx) plus a mapping that says where each
+placeholder's value lives in the workbook. The template is compiled once;
+each workbook is then loaded once, read-only, all of its values are
+resolved in one pass, and the filled-in document is written by swapping
+the values into the template's XML. Batches run across processes:
+
+    python excel_report.py plans/*.xlsx --output-dir synopses
+
+or from code:
+
+    from excel_report import reportGenerator, SYNOPSIS_MAPPING
+
+    generator = reportGenerator("assets/SYNOPSIS_SHEET.docx", SYNOPSIS_MAPPING)
+    generator.generate("plan.xlsx", "plan_synopsis.docx")
+    generated, failed = generator.generate_batch(paths, "synopses")
+
+Placeholders the mapping doesn't cover are left in the document as they
+are, to be filled in by hand.
+"""
+import argparse
+import bisect
+import logging
+import os
+import re
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from excel_manager import excelManager
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+DEFAULT_TEMPLATE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "SYNOPSIS_SHEET.docx")
+
+# excelManager methods a mapping may call, as ("read_title_total", sheet, cell, title)
+READ_METHODS = frozenset(["read_cell", "read_range", "read_total", "read_title_total", "read_items", "read_columns"])
+
+
+def _synopsis_mapping():
+    """
+    Map the placeholders of assets/SYNOPSIS_SHEET.docx to the "DATA for
+    Synopsis Sheet" tables of assets/COST_PLAN_PROJECT_NAME.xlsx.
+
+    Activities are taken by position from each table column, read down from
+    the first activity row (25) to the row before the total, so plans with
+    fewer activities leave the remaining rows of the synopsis blank. Row 24
+    is not used: the operational table has no header over some of its cost
+    columns.
+    """
+    mapping = {"TITLE": "'Cost Breakdown'!A2"}
+    tables = {
+        "CAPITAL": ("A", {"TOTAL_COST": "B", "CONTINGENCY": "C", "FULL_UP_COSTS": "D", "HST": "E", "TOTAL_PROJECT_COSTS": "F"}),
+        "OPERATIONAL": ("H", {"TOTAL_COST": "I", "CONTINGENCY": "J", "FULL_UP_COSTS": "K", "HST": "L", "TOTAL_PROJECT_COSTS": "M"}),
+    }
+    for table, (item_column, cost_columns) in tables.items():
+        items = ("read_items", "Cost Breakdown", f"{item_column}25", None, 1)
+        for activity in range(1, 6):
+            mapping[f"{table}_ACTIVITY_{activity}"] = (items, activity - 1)
+        for name, column in cost_columns.items():
+            costs = ("read_items", "Cost Breakdown", f"{column}25", None, 1)
+            for activity in range(1, 6):
+                mapping[f"{table}_ACTIVITY_{activity}_{name}"] = (costs, activity - 1)
+            mapping[f"{table}_EXENDITURES_{name}"] = ("read_total", "Cost Breakdown", f"{column}25")
+    return mapping
+
+
+SYNOPSIS_MAPPING = _synopsis_mapping()
+
+_PLACEHOLDER_RE = re.compile(r"\{\{([^{}]+?)\}\}")
+_TEXT_NODE_RE = re.compile(r"(<w:t(?:\s[^>]*)?>)([^<]*)(</w:t>)")
+# Parts of a .docx that can hold placeholders
+_TEMPLATE_PART_RE = re.compile(r"^word/(?:document|header\d*|footer\d*|footnotes|endnotes)\.xml$")
+
+
+def _unescape(text):
+    return text.replace("&lt;", "<").replace("&gt;", ">").replace("&quot;", '"').replace("&apos;", "'").replace("&amp;", "&")
+
+
+def _escape(text):
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _compile_part(xml):
+    """
+    Rewrite a WordprocessingML part so that every placeholder sits whole in one <w:t>.
+
+    Word often splits "{{TITLE}}" over several runs ("{{", "TITLE", "}}")
+    when it is typed or edited. The text of all <w:t> nodes is joined,
+    placeholders are found in the joined text, and each one that spans nodes
+    is moved into the node where it starts, keeping that run's formatting.
+    Placeholders crossing a paragraph boundary are left alone.
+    """
+    nodes = list(_TEXT_NODE_RE.finditer(xml))
+    texts = [node.group(2) for node in nodes]
+    starts = []
+    offset = 0
+    for text in texts:
+        starts.append(offset)
+        offset += len(text)
+    joined = "".join(texts)
+
+    # Right to left, so each edit only changes text after the spans still to do
+    for match in reversed(list(_PLACEHOLDER_RE.finditer(joined))):
+        start, end = match.span()
+        first = bisect.bisect_right(starts, start) - 1
+        last = bisect.bisect_right(starts, end - 1) - 1
+        if first == last or "</w:p>" in xml[nodes[first].end():nodes[last].start()]:
+            continue
+        texts[first] = texts[first][:start - starts[first]] + match.group(0)
+        for index in range(first + 1, last):
+            texts[index] = ""
+        texts[last] = texts[last][end - starts[last]:]
+
+    pieces = []
+    position = 0
+    for node, text in zip(nodes, texts):
+        open_tag = node.group(1)
+        if "{{" in text and "xml:space" not in open_tag:
+            # Values may start or end with spaces, which Word drops without this
+            open_tag = open_tag[:-1] + ' xml:space="preserve">'
+        pieces.append(xml[position:node.start()])
+        pieces.append(open_tag + text + node.group(3))
+        position = node.end()
+    pieces.append(xml[position:])
+    return "".join(pieces)
+
+
+def _format_value(value):
+    """
+    Turn a resolved value into document text.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        # read_items gives a column of values, read_range/read_columns rows of them
+        return "\n".join(", ".join(_format_value(item) for item in line) if isinstance(line, (list, tuple))
+                         else _format_value(line) for line in value)
+    return str(value)
+
+
+class reportGenerator:
+    def __init__(self, template_path=DEFAULT_TEMPLATE, mapping=None, default_sheet=None):
+        """
+        Compile a .docx template for filling from workbooks.
+
+        mapping is {placeholder: source}, where source is one of:
+        - a cell reference, e.g. "'Cost Breakdown'!B6" (sheet optional when
+          default_sheet is given) or a defined name
+        - a tuple naming an excelManager read method and its arguments, e.g.
+          ("read_title_total", "Cost Breakdown", "A24", "Total Project Costs")
+        - a function taking the excelManager and returning the value (use
+          module-level functions so batches can send them to other processes)
+        - a pair (source, index) taking one entry of a list-valued source,
+          e.g. the second item under a header:
+          (("read_items", "Cost Breakdown", "A24"), 2); entries past the end
+          of the list are blank
+
+        Placeholder names are matched as written between the braces.
+        """
+        import zipfile
+
+        self.template_path = template_path
+        self.mapping = dict(SYNOPSIS_MAPPING if mapping is None else mapping)
+        self.default_sheet = default_sheet
+
+        # Keep every member of the template; only the text parts get rewritten per report
+        self._members = []
+        self._parts = {}
+        with zipfile.ZipFile(template_path) as archive:
+            for info in archive.infolist():
+                data = archive.read(info)
+                self._members.append((info, data))
+                if _TEMPLATE_PART_RE.match(info.filename):
+                    xml = _compile_part(data.decode("utf-8"))
+                    if "{{" in xml:
+                        self._parts[info.filename] = xml
+
+        self.placeholders = set()
+        for xml in self._parts.values():
+            self.placeholders.update(_unescape(name.strip()) for name in _PLACEHOLDER_RE.findall(xml))
+        unmapped = self.placeholders - self.mapping.keys()
+        logger.info("Compiled report template %s: %s placeholders, %s without a mapping", template_path,
+                    len(self.placeholders), len(unmapped))
+
+    def _read(self, manager, source, cache):
+        if isinstance(source, list):
+            source = tuple(source)
+        if source in cache:
+            return cache[source]
+        if isinstance(source, tuple) and isinstance(source[0], (tuple, list)):
+            entries, index = source
+            entries = self._read(manager, entries, cache)
+            value = entries[index] if index < len(entries) else None
+        elif callable(source):
+            value = source(manager)
+        elif isinstance(source, str):
+            sheet_name = self.default_sheet or manager.get_sheet_names()[0]
+            value = manager.read_cell(sheet_name, source)
+        else:
+            method, *args = source
+            if method not in READ_METHODS:
+                raise ValueError(f"Unsupported report source: {method}")
+            value = getattr(manager, method)(*args)
+        cache[source] = value
+        return value
+
+    def resolve(self, workbook):
+        """
+        Return {placeholder: text} for every mapped placeholder of the template.
+
+        workbook is an excelManager or a path, which is then opened
+        read-only and closed again before returning. Each source is read
+        once, however many placeholders share it. A source that can't be
+        read is logged and leaves its placeholder empty.
+        """
+        owned = not isinstance(workbook, excelManager)
+        manager = excelManager(workbook, read_only=True) if owned else workbook
+        try:
+            cache = {}
+            values = {}
+            for name in self.placeholders:
+                source = self.mapping.get(name)
+                if source is None:
+                    continue
+                try:
+                    values[name] = _format_value(self._read(manager, source, cache))
+                except Exception as e:
+                    logger.warning("Could not resolve %s from %s: %s", name, manager.file_path, e)
+                    values[name] = ""
+            return values
+        finally:
+            # Only close what was opened here; a caller's manager stays usable
+            if owned:
+                manager.close()
+
+    def render(self, values, output_path):
+        """
+        Write the template to output_path with each {{NAME}} replaced by values[NAME].
+
+        Placeholders without a value are left as they are. Line breaks in
+        values become line breaks in the document. The file is written to a
+        temporary name first, so a failed render never leaves a partial file.
+        """
+        import zipfile
+
+        def substitute(match):
+            value = values.get(_unescape(match.group(1).strip()))
+            if value is None:
+                return match.group(0)
+            return _escape(value).replace("\n", '</w:t><w:br/><w:t xml:space="preserve">')
+
+        directory, name = os.path.split(os.path.abspath(output_path))
+        temp_path = os.path.join(directory, f".~{name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with zipfile.ZipFile(temp_path, "w") as archive:
+                for info, data in self._members:
+                    xml = self._parts.get(info.filename)
+                    if xml is not None:
+                        data = _PLACEHOLDER_RE.sub(substitute, xml).encode("utf-8")
+                    archive.writestr(info, data)
+            os.replace(temp_path, output_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return output_path
+
+    def generate(self, workbook_path, output_path):
+        """
+        Resolve the values of one workbook and render its report.
+        """
+        self.render(self.resolve(workbook_path), output_path)
+        logger.info("Generated %s from %s", output_path, workbook_path)
+        return output_path
+
+    def generate_batch(self, workbook_paths, output_dir, max_workers=None, suffix="_synopsis"):
+        """
+        Generate a report per workbook into output_dir as "<workbook name><suffix>.docx".
+
+        Workbooks are spread over max_workers processes (default: one per
+        CPU); each process compiles the template once and reuses it. Returns
+        (generated, failed): {workbook path: report path} and
+        {workbook path: exception}. A failing workbook doesn't stop the batch.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        jobs = {}
+        for workbook_path in workbook_paths:
+            stem = os.path.splitext(os.path.basename(workbook_path))[0]
+            jobs[workbook_path] = os.path.join(output_dir, f"{stem}{suffix}.docx")
+
+        generated, failed = {}, {}
+        max_workers = min(max_workers or os.cpu_count() or 1, len(jobs)) or 1
+        if max_workers == 1:
+            for workbook_path, output_path in jobs.items():
+                try:
+                    generated[workbook_path] = self.generate(workbook_path, output_path)
+                except Exception as e:
+                    logger.error("Report for %s failed: %s", workbook_path, e)
+                    failed[workbook_path] = e
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                     initargs=(self.template_path, self.mapping, self.default_sheet)) as executor:
+                futures = {executor.submit(_generate_in_worker, workbook_path, output_path): workbook_path
+                           for workbook_path, output_path in jobs.items()}
+                for future in as_completed(futures):
+                    workbook_path = futures[future]
+                    try:
+                        generated[workbook_path] = future.result()
+                    except Exception as e:
+                        logger.error("Report for %s failed: %s", workbook_path, e)
+                        failed[workbook_path] = e
+
+        logger.info("Generated %s reports in %s (%s failed)", len(generated), output_dir, len(failed))
+        return generated, failed
+
+
+# The generator of a batch worker process, compiled once by _init_worker
+_worker_generator = None
+
+
+def _init_worker(template_path, mapping, default_sheet):
+    global _worker_generator
+    _worker_generator = reportGenerator(template_path, mapping, default_sheet)
+
+
+def _generate_in_worker(workbook_path, output_path):
+    return _worker_generator.generate(workbook_path, output_path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate Word synopses from cost plan workbooks.")
+    parser.add_argument("workbooks", nargs="+", help="cost plan workbooks (.xlsx, .xls, .xlsb)")
+    parser.add_argument("--output-dir", default="synopses", help="directory for the generated documents")
+    parser.add_argument("--template", default=DEFAULT_TEMPLATE, help="the .docx template with {{PLACEHOLDER}} fields")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    args = parser.parse_args(argv)
+
+    generator = reportGenerator(args.template, SYNOPSIS_MAPPING)
+    generated, failed = generator.generate_batch(args.workbooks, args.output_dir, max_workers=args.workers)
+    for workbook_path, output_path in sorted(generated.items()):
+        print(f"{workbook_path} -> {output_path}")
+    for workbook_path, error in sorted(failed.items()):
+        print(f"{workbook_path} failed: {error}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
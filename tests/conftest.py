@@ -0,0 +1,17 @@
+import os
+import shutil
+
+import pytest
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets")
+COST_PLAN = os.path.join(ASSETS_DIR, "COST_PLAN_PROJECT_NAME.xlsx")
+
+
+@pytest.fixture
+def cost_plan(tmp_path):
+    """
+    A scratch copy of the sample cost plan that tests may edit and save.
+    """
+    path = tmp_path / "cost_plan.xlsx"
+    shutil.copy(COST_PLAN, path)
+    return str(path)
@@ -0,0 +1,97 @@
+import zipfile
+
+import pytest
+
+from excel_manager import _cell_xml, _drop_formula_values, _force_full_calc, _patch_sheet_xml, excelManager
+
+SHEET_XML = (
+    '<worksheet><dimension ref="A1:B2"/><sheetData>'
+    '<row r="1" spans="1:2"><c r="A1" t="s"><v>0</v></c><c r="B1" s="3"><v>5</v></c></row>'
+    '<row r="2"><c r="A2"><f>B1*2</f><v>10</v></c><c r="B2" t="str"><f>A1</f><v>x</v></c></row>'
+    '</sheetData></worksheet>'
+)
+
+
+def test_cell_xml_writes_plain_values():
+    assert _cell_xml("A1", None, 0) == '<c r="A1"/>'
+    assert _cell_xml("A1", True, 2) == '<c r="A1" s="2" t="b"><v>1</v></c>'
+    assert _cell_xml("A1", 7, 0) == '<c r="A1"><v>7</v></c>'
+    assert _cell_xml("A1", 2.5, 0) == '<c r="A1"><v>2.5</v></c>'
+    assert _cell_xml("A1", "=SUM(B1:B3)", 0) == '<c r="A1"><f>SUM(B1:B3)</f></c>'
+    assert _cell_xml("A1", "a<b", 0) == '<c r="A1" t="inlineStr"><is><t xml:space="preserve">a&lt;b</t></is></c>'
+
+
+def test_cell_xml_writes_numpy_numbers_as_plain_numbers():
+    numpy = pytest.importorskip("numpy")
+    assert _cell_xml("A1", numpy.int64(3), 0) == '<c r="A1"><v>3</v></c>'
+    assert _cell_xml("A1", numpy.float64(2.5), 0) == '<c r="A1"><v>2.5</v></c>'
+
+
+def test_cell_xml_leaves_unsupported_values_to_openpyxl():
+    assert _cell_xml("A1", float("nan"), 0) is None
+    assert _cell_xml("A1", "bad\x01text", 0) is None
+    assert _cell_xml("A1", object(), 0) is None
+
+
+def test_patch_sheet_xml_replaces_and_inserts_cells():
+    patched = _patch_sheet_xml(SHEET_XML, {(1, 2): 9, (1, 3): "new", (4, 1): 1})
+
+    # Edited cells keep their style; untouched cells are copied verbatim
+    assert '<c r="B1" s="3"><v>9</v></c>' in patched
+    assert '<c r="A1" t="s"><v>0</v></c>' in patched
+    assert '<c r="C1" t="inlineStr">' in patched
+    assert '<c r="A2"><f>B1*2</f><v>10</v></c>' in patched
+    # New rows are added in order and the stale spans and dimension are updated
+    assert patched.index('<row r="2"') < patched.index('<row r="4"')
+    assert 'spans=' not in patched
+    assert '<dimension ref="A1:C4"/>' in patched
+
+
+def test_drop_formula_values_strips_cached_results_only():
+    dropped = _drop_formula_values(SHEET_XML)
+
+    assert '<c r="A2"><f>B1*2</f></c>' in dropped
+    assert '<c r="B2"><f>A1</f></c>' in dropped
+    assert '<c r="A1" t="s"><v>0</v></c>' in dropped
+    assert '<c r="B1" s="3"><v>5</v></c>' in dropped
+
+
+def test_force_full_calc():
+    assert 'fullCalcOnLoad="1"' in _force_full_calc('<workbook><calcPr calcId="191029"/></workbook>')
+    assert _force_full_calc('<workbook><calcPr fullCalcOnLoad="0"/></workbook>') == \
+        '<workbook><calcPr fullCalcOnLoad="1"/></workbook>'
+    assert _force_full_calc('<workbook><sheets/></workbook>') == \
+        '<workbook><sheets/><calcPr fullCalcOnLoad="1"/></workbook>'
+
+
+def test_value_edits_save_as_a_delta(cost_plan):
+    with zipfile.ZipFile(cost_plan) as archive:
+        styles = archive.read("xl/styles.xml")
+
+    manager = excelManager(cost_plan, instrument=True)
+    manager.write_cell("Cost Breakdown", "B6", 1000)
+    manager.save()
+
+    assert manager.get_stats()["counters"]["delta_saves"] == 1
+    assert manager.read_cell("Cost Breakdown", "B6") == "$1,000.00"
+    # Dependent formulas, on this sheet and others, read as empty until recalculated
+    assert manager.read_cell("Cost Breakdown", "C6") == ""
+    assert manager.read_cell("Distribution Plan", "G3") == ""
+    assert manager.formula_workbook["Cost Breakdown"]["C6"].value == "=B6"
+
+    with zipfile.ZipFile(cost_plan) as archive:
+        assert archive.read("xl/styles.xml") == styles
+        assert "xl/calcChain.xml" not in archive.namelist()
+        assert 'fullCalcOnLoad="1"' in archive.read("xl/workbook.xml").decode()
+
+
+def test_structural_changes_fall_back_to_a_full_save(cost_plan):
+    manager = excelManager(cost_plan, instrument=True)
+    manager.write_cell("Cost Breakdown", "B6", 1000)
+    manager.create_sheet("Notes")
+    manager.save()
+
+    counters = manager.get_stats()["counters"]
+    assert counters["full_saves"] == 1
+    assert "delta_saves" not in counters
+    assert excelManager(cost_plan).get_sheet_names() == ["Cost Breakdown", "Distribution Plan", "Notes"]
@@ -0,0 +1,11 @@
+from excel_benchmark import IMPORT_BUDGET_MS, measure_import
+
+
+def test_import_stays_within_budget_and_probe_avoids_openpyxl():
+    # measure_import imports excel_manager and runs excelProbe queries in fresh interpreters
+    seconds, loaded, created = measure_import(runs=3)
+
+    assert seconds * 1000 <= IMPORT_BUDGET_MS, f"import took {seconds * 1000:.1f} ms"
+    assert not [module for module in loaded if module.startswith("openpyxl")]
+    assert loaded == []
+    assert created == []
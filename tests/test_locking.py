@@ -0,0 +1,106 @@
+import threading
+import time
+
+import pytest
+
+from excel_manager import _ReadWriteLock, excelManager
+
+
+def _start(target):
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_readers_share_the_lock():
+    lock = _ReadWriteLock()
+    inside = threading.Barrier(3, timeout=5)
+
+    def reader():
+        with lock.read():
+            inside.wait()
+
+    threads = [_start(reader) for _ in range(2)]
+    # Only passes if both readers hold the lock at the same time as this thread
+    with lock.read():
+        inside.wait()
+    for thread in threads:
+        thread.join(5)
+
+
+def test_writer_waits_for_readers():
+    lock = _ReadWriteLock()
+    events = []
+    lock.acquire_read()
+
+    def writer():
+        with lock.write():
+            events.append("write")
+
+    thread = _start(writer)
+    time.sleep(0.1)
+    events.append("read released")
+    lock.release_read()
+    thread.join(5)
+
+    assert events == ["read released", "write"]
+
+
+def test_waiting_writer_blocks_new_readers():
+    lock = _ReadWriteLock()
+    events = []
+    lock.acquire_read()
+
+    def writer():
+        with lock.write():
+            time.sleep(0.1)
+            events.append("write")
+
+    def reader():
+        with lock.read():
+            events.append("read")
+
+    writer_thread = _start(writer)
+    time.sleep(0.1)
+    reader_thread = _start(reader)
+    time.sleep(0.1)
+    lock.release_read()
+    writer_thread.join(5)
+    reader_thread.join(5)
+
+    assert events == ["write", "read"]
+
+
+def test_lock_is_reentrant_for_its_owner():
+    lock = _ReadWriteLock()
+    with lock.write():
+        with lock.write():
+            with lock.read():
+                pass
+    with lock.read():
+        with lock.read():
+            pass
+
+    # Fully released: another thread can take the write lock
+    thread = _start(lambda: lock.write().__enter__())
+    thread.join(5)
+    assert not thread.is_alive()
+
+
+def test_upgrading_a_read_lock_raises():
+    lock = _ReadWriteLock()
+    with lock.read():
+        with pytest.raises(RuntimeError):
+            lock.acquire_write()
+    # The failed upgrade leaves the lock usable
+    with lock.write():
+        pass
+
+
+def test_write_inside_read_raises_instead_of_deadlocking(cost_plan):
+    manager = excelManager(cost_plan)
+    with manager._lock.read():
+        with pytest.raises(RuntimeError):
+            manager.write_cell("Cost Breakdown", "K6", 1)
+    manager.write_cell("Cost Breakdown", "K6", 1)
+    assert manager.formula_workbook["Cost Breakdown"]["K6"].value == 1
@@ -0,0 +1,56 @@
+import zipfile
+
+import pytest
+
+from conftest import COST_PLAN
+from excel_manager import excelProbe
+
+HEADERS = ["Activities", "Project ABC", "Total Costs", "Emergency 15%", "Full Up Costs", "HST", "Total Project Costs"]
+
+
+def test_sheet_names_and_dimensions():
+    with excelProbe(COST_PLAN) as probe:
+        assert probe.get_sheet_names() == ["Cost Breakdown", "Distribution Plan"]
+        assert probe.count_sheets() == 2
+        assert probe.get_dimensions("Cost Breakdown") == "A2:M31"
+        assert probe.get_dimensions() == {"Cost Breakdown": "A2:M31", "Distribution Plan": "B1:G5"}
+
+
+def test_rows_and_titles():
+    with excelProbe(COST_PLAN) as probe:
+        rows = probe.get_rows("Cost Breakdown", max_rows=6)
+        assert rows[:2] == [[], ["PROJECT NAME"]]
+        assert rows[4] == HEADERS
+        assert rows[5][1:3] == [2631699, 2631699]
+        assert probe.get_header_row("Distribution Plan", row=2) == [None, "Unit", "DHTC", "CIRJ", "CSOR", "CSOTC", "Total"]
+
+        assert probe.has_title("total project costs", "Cost Breakdown", row=5)
+        assert probe.has_title("DHTC", row=2)
+        assert not probe.has_title("DHTC", "Cost Breakdown", row=2)
+
+
+def test_missing_and_invalid_files(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        excelProbe(str(tmp_path / "missing.xlsx"))
+    not_a_workbook = tmp_path / "notes.xlsx"
+    not_a_workbook.write_text("not a zip")
+    with pytest.raises(ValueError):
+        excelProbe(str(not_a_workbook))
+    with excelProbe(COST_PLAN) as probe, pytest.raises(ValueError):
+        probe.get_rows("No Such Sheet")
+
+
+def test_shared_strings_found_through_the_workbook_relationships(tmp_path):
+    # Writers other than Excel may store the shared strings under another name
+    moved = tmp_path / "moved.xlsx"
+    with zipfile.ZipFile(COST_PLAN) as source, zipfile.ZipFile(moved, "w", zipfile.ZIP_DEFLATED) as target:
+        for item in source.infolist():
+            data = source.read(item.filename)
+            if item.filename in ("xl/_rels/workbook.xml.rels", "[Content_Types].xml"):
+                data = data.replace(b"sharedStrings.xml", b"strings/shared.xml")
+            name = "xl/strings/shared.xml" if item.filename == "xl/sharedStrings.xml" else item.filename
+            target.writestr(name, data)
+
+    with excelProbe(str(moved)) as probe:
+        assert probe.get_header_row("Cost Breakdown", row=5) == HEADERS
+
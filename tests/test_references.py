@@ -0,0 +1,45 @@
+import pytest
+
+from excel_manager import MAX_COLUMN, MAX_ROW, _parse_reference, coordinate_to_tuple, get_column_letter
+
+
+@pytest.mark.parametrize("reference, expected", [
+    ("A1", (None, None, 1, 1, 1, 1)),
+    ("$B$6", (None, None, 6, 2, 6, 2)),
+    ("b6", (None, None, 6, 2, 6, 2)),
+    ("A1:C3", (None, None, 1, 1, 3, 3)),
+    ("C3:A1", (None, None, 1, 1, 3, 3)),
+    ("A:C", (None, None, None, 1, None, 3)),
+    ("$2:$5", (None, None, 2, None, 5, None)),
+    ("Sheet2!A1", ("Sheet2", None, 1, 1, 1, 1)),
+    ("'Cost Breakdown'!G6:G30", ("Cost Breakdown", None, 6, 7, 30, 7)),
+    ("'Q1!Plan'!B3", ("Q1!Plan", None, 3, 2, 3, 2)),
+    ("'Bob''s'!A1", ("Bob's", None, 1, 1, 1, 1)),
+    ("XFD1048576", (None, None, MAX_ROW, MAX_COLUMN, MAX_ROW, MAX_COLUMN)),
+    ("Totals", (None, "Totals", None, None, None, None)),
+    ("Plan!Total_Costs", ("Plan", "Total_Costs", None, None, None, None)),
+])
+def test_parse_reference(reference, expected):
+    assert _parse_reference(reference) == expected
+
+
+@pytest.mark.parametrize("reference", [
+    "A0",
+    f"A{MAX_ROW + 1}",
+    "XFE1",
+    "A1:B",
+    "1:B",
+    "A-1",
+    "",
+])
+def test_parse_reference_rejects_malformed(reference):
+    with pytest.raises(ValueError):
+        _parse_reference(reference)
+
+
+def test_coordinate_helpers_round_trip():
+    for column in (1, 26, 27, 52, 702, 703, MAX_COLUMN):
+        letters = get_column_letter(column)
+        assert coordinate_to_tuple(f"{letters}7") == (7, column)
+    with pytest.raises(ValueError):
+        coordinate_to_tuple("7A")